@@ -17,10 +17,7 @@ TEMP_DIR: Path = Path(gettempdir()) / "audio_processing_lab"
 UPLOAD_DIR: Path = TEMP_DIR / "uploads"
 PROCESSED_DIR: Path = TEMP_DIR / "processed"
 VISUALIZATION_DIR: Path = TEMP_DIR / "visualizations"
-
-# Ensure directories exist at import time
-for _dir in (UPLOAD_DIR, PROCESSED_DIR, VISUALIZATION_DIR):
-    _dir.mkdir(parents=True, exist_ok=True)
+# Directories are created lazily by ``utils.file_manager`` on first use.
 
 # ---------------------------------------------------------------------------
 # Upload Constraints
@@ -33,6 +30,8 @@ ALLOWED_EXTENSIONS: set[str] = {".mp3", ".wav", ".ogg", ".flac", ".m4a"}
 # Audio Processing Defaults
 # ---------------------------------------------------------------------------
 DEFAULT_SAMPLE_RATE: int = 44100
+DECODE_CACHE_SIZE: int = 4  # Decoded uploads kept in RAM for repeat effects
+RESULT_MEMO_SIZE: int = 32  # Recent identical /process requests answered from disk
 
 # ---------------------------------------------------------------------------
 # File Cleanup
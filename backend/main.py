@@ -12,10 +12,16 @@ import logging
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from backend.config import FILE_TTL_MINUTES
 from backend.routers import download, process, upload, visualize
-from backend.utils.file_manager import cleanup_old_files
+from backend.utils.file_manager import (
+    cleanup_old_files,
+    has_temp_files,
+    seconds_until_next_expiry,
+    validate_file_size,
+)
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -37,6 +43,7 @@ app = FastAPI(
         "Upload MP3s, apply DSP effects, visualise results, and download."
     ),
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS — allow Streamlit frontend (typically on port 8501)
@@ -48,6 +55,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Multipart framing (boundaries, part headers) adds a little on top of the
+# file itself; allow for it so files right at the limit are not rejected.
+_MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class _RejectOversizedUploads:
+    """
+    Answer 413 from ``Content-Length`` before the upload body is read.
+
+    FastAPI parses the multipart form before the endpoint (or any of its
+    dependencies) runs, so this has to happen in middleware.  It is plain
+    ASGI so every other request, streamed downloads included, passes
+    straight through.  Bodies without the header still hit the streaming
+    size check in the upload router.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] == "/upload":
+            content_length = dict(scope["headers"]).get(b"content-length", b"")
+            if content_length.isdigit():
+                try:
+                    validate_file_size(int(content_length) - _MULTIPART_OVERHEAD_BYTES)
+                except ValueError as exc:
+                    response = JSONResponse(status_code=413, content={"detail": str(exc)})
+                    await response(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(_RejectOversizedUploads)
+
+
 # ---------------------------------------------------------------------------
 # Routers
 # ---------------------------------------------------------------------------
@@ -70,12 +112,18 @@ async def health() -> dict:
 # Background cleanup task
 # ---------------------------------------------------------------------------
 async def _periodic_cleanup() -> None:
-    """Delete stale temp files every ``FILE_TTL_MINUTES / 2`` minutes."""
-    interval = FILE_TTL_MINUTES * 30  # seconds (half of TTL)
+    """
+    Delete stale temp files as they reach ``FILE_TTL_MINUTES``.
+
+    Sleeps until the oldest tracked file expires (or half the TTL when
+    nothing is tracked) instead of waking on a fixed interval, and skips
+    the scan entirely when every temp directory is empty.
+    """
     while True:
-        await asyncio.sleep(interval)
+        await asyncio.sleep(seconds_until_next_expiry())
         try:
-            cleanup_old_files()
+            if has_temp_files():
+                cleanup_old_files()
         except Exception:
             logger.exception("Cleanup task error")
 
@@ -38,6 +38,26 @@ class ProcessRequest(BaseModel):
         default_factory=dict,
         description="Effect-specific parameters",
     )
+    visualize: bool = Field(
+        False,
+        description="Also render the processed waveform and spectrogram",
+    )
+
+
+class BatchProcessRequest(BaseModel):
+    """Body of POST /process/batch."""
+    file_ids: list[str] = Field(
+        ..., min_length=1, description="UUIDs of the uploaded files",
+    )
+    effect: EffectName = Field(..., description="Effect to apply to every file")
+    parameters: dict = Field(
+        default_factory=dict,
+        description="Effect-specific parameters, shared by every file",
+    )
+    visualize: bool = Field(
+        False,
+        description="Also render each processed waveform and spectrogram",
+    )
 
 
 class TrimParams(BaseModel):
@@ -87,6 +107,13 @@ class EqualizerParams(BaseModel):
 # ---------------------------------------------------------------------------
 # Response Models
 # ---------------------------------------------------------------------------
+class VisualizationResponse(BaseModel):
+    """Returned visualization metadata."""
+    file_id: str
+    waveform_url: str
+    spectrogram_url: str
+
+
 class UploadResponse(BaseModel):
     """Returned after a successful upload."""
     file_id: str
@@ -94,6 +121,10 @@ class UploadResponse(BaseModel):
     duration_seconds: float
     sample_rate: int
     channels: int
+    viz: Optional[VisualizationResponse] = Field(
+        None,
+        description="Original waveform/spectrogram URLs, when include_viz was set",
+    )
     message: str = "Upload successful"
 
 
@@ -103,16 +134,42 @@ class ProcessResponse(BaseModel):
     processed_file_id: str
     effect: str
     processing_time_seconds: float
+    content_sha256: Optional[str] = Field(
+        None,
+        description="SHA-256 of the processed PCM; equal for identical outputs",
+    )
     message: str = "Processing complete"
 
 
+class BatchProcessResponse(BaseModel):
+    """Returned by POST /process/batch — one result per input file."""
+    results: list[ProcessResponse]
+
+
+class JobState(str, Enum):
+    """Lifecycle of a background processing job."""
+    RUNNING = "running"
+    DONE = "done"
+    ERROR = "error"
+
+
+class JobResponse(BaseModel):
+    """Returned when a processing job is accepted."""
+    job_id: str
+
+
+class JobStatusResponse(BaseModel):
+    """Returned by GET /process/status/{job_id}."""
+    job_id: str
+    state: JobState
+    elapsed_seconds: float
+    result: Optional[ProcessResponse] = None
+    status_code: Optional[int] = Field(
+        None, description="HTTP status /process would have failed with",
+    )
+    detail: Optional[str] = None
+
+
 class ErrorResponse(BaseModel):
     """Standard error envelope."""
     detail: str
-
-
-class VisualizationResponse(BaseModel):
-    """Returned visualization metadata."""
-    file_id: str
-    waveform_url: str
-    spectrogram_url: str
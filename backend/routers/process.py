@@ -4,34 +4,52 @@ Process Router — accepts effect + params, delegates to pipeline.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from typing import TypeVar
 
 from fastapi import APIRouter, HTTPException
 
-from backend.models.schemas import ProcessRequest, ProcessResponse
-from backend.services.audio_pipeline import process_audio
+from backend.config import FILE_TTL_MINUTES
+from backend.models.schemas import (
+    BatchProcessRequest,
+    BatchProcessResponse,
+    JobResponse,
+    JobState,
+    JobStatusResponse,
+    ProcessRequest,
+    ProcessResponse,
+)
+from backend.services.audio_pipeline import process_audio, process_audio_batch
+from backend.utils.file_manager import generate_file_id
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["Process"])
 
+_T = TypeVar("_T")
 
-@router.post("/process", response_model=ProcessResponse)
-async def process_effect(request: ProcessRequest) -> ProcessResponse:
-    """
-    Apply an audio effect to a previously uploaded file.
 
-    Accepts ``file_id``, ``effect`` name, and effect-specific ``parameters``.
-    """
+async def _run(request: ProcessRequest) -> ProcessResponse:
+    """Run the pipeline, mapping its errors to HTTP status codes."""
     logger.info(
         "Process request — file_id=%s, effect=%s",
         request.file_id, request.effect.value,
     )
+    return await _map_errors(process_audio(
+        file_id=request.file_id,
+        effect=request.effect,
+        parameters=request.parameters,
+        visualize=request.visualize,
+    ))
+
+
+async def _map_errors(pipeline: Awaitable[_T]) -> _T:
+    """Await a pipeline call, mapping its errors to HTTP status codes."""
     try:
-        result = process_audio(
-            file_id=request.file_id,
-            effect=request.effect,
-            parameters=request.parameters,
-        )
+        return await pipeline
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc))
     except ValueError as exc:
@@ -40,4 +58,116 @@ async def process_effect(request: ProcessRequest) -> ProcessResponse:
         logger.exception("Processing failed")
         raise HTTPException(status_code=500, detail=f"Processing error: {exc}")
 
-    return result
+
+@router.post("/process", response_model=ProcessResponse)
+async def process_effect(request: ProcessRequest) -> ProcessResponse:
+    """
+    Apply an audio effect to a previously uploaded file.
+
+    Accepts ``file_id``, ``effect`` name, and effect-specific ``parameters``.
+    With ``visualize`` set, the processed waveform and spectrogram are
+    rendered while the MP3 is encoded.
+    """
+    return await _run(request)
+
+
+@router.post("/process/batch", response_model=BatchProcessResponse)
+async def process_batch(request: BatchProcessRequest) -> BatchProcessResponse:
+    """
+    Apply one effect with one parameter set to several uploaded files.
+
+    Parameters are validated once and the effect runs over the whole
+    batch; ``results`` follows the order of ``file_ids``.
+    """
+    logger.info(
+        "Batch process request — %d file(s), effect=%s",
+        len(request.file_ids), request.effect.value,
+    )
+    results = await _map_errors(process_audio_batch(
+        file_ids=request.file_ids,
+        effect=request.effect,
+        parameters=request.parameters,
+        visualize=request.visualize,
+    ))
+    return BatchProcessResponse(results=results)
+
+
+# ---------------------------------------------------------------------------
+# Background jobs
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _Job:
+    """A ``/process`` request running on the event loop."""
+    started: float = field(default_factory=time.monotonic)
+    finished: float | None = None
+    result: ProcessResponse | None = None
+    error: HTTPException | None = None
+    task: asyncio.Task | None = None
+
+
+# job_id → job.  Finished jobs are forgotten once their output files
+# would have expired anyway.
+_jobs: dict[str, _Job] = {}
+_JOB_TTL_SECONDS = FILE_TTL_MINUTES * 60
+
+
+def _forget_expired_jobs() -> None:
+    """Drop jobs that finished more than ``_JOB_TTL_SECONDS`` ago."""
+    cutoff = time.monotonic() - _JOB_TTL_SECONDS
+    for job_id in [
+        jid for jid, job in _jobs.items()
+        if job.finished is not None and job.finished < cutoff
+    ]:
+        del _jobs[job_id]
+
+
+async def _run_job(job: _Job, request: ProcessRequest) -> None:
+    try:
+        job.result = await _run(request)
+    except HTTPException as exc:
+        job.error = exc
+    finally:
+        job.finished = time.monotonic()
+
+
+@router.post("/process/jobs", response_model=JobResponse, status_code=202)
+async def submit_process_job(request: ProcessRequest) -> JobResponse:
+    """
+    Start processing in the background and return a ``job_id`` at once.
+
+    Takes the same body as ``/process``; poll
+    ``/process/status/{job_id}`` for the outcome.
+    """
+    _forget_expired_jobs()
+    job_id = generate_file_id()
+    job = _jobs[job_id] = _Job()
+    job.task = asyncio.create_task(_run_job(job, request))  # ref kept in job
+    return JobResponse(job_id=job_id)
+
+
+@router.get("/process/status/{job_id}", response_model=JobStatusResponse)
+async def process_job_status(job_id: str) -> JobStatusResponse:
+    """
+    Report a background job: ``running``, ``done`` (with the
+    ``/process`` response) or ``error`` (with its status code and detail).
+    """
+    _forget_expired_jobs()
+    job = _jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+    end = job.finished if job.finished is not None else time.monotonic()
+    status = JobStatusResponse(
+        job_id=job_id,
+        state=JobState.RUNNING,
+        elapsed_seconds=round(end - job.started, 3),
+    )
+    if job.result is not None:
+        status.state = JobState.DONE
+        status.result = job.result
+    elif job.error is not None:
+        status.state = JobState.ERROR
+        status.status_code = job.error.status_code
+        status.detail = job.error.detail
+    return status
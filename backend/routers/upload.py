@@ -4,15 +4,19 @@ Upload Router — handles file ingestion & validation.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-import shutil
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
+import aiofiles
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
 
-from backend.models.schemas import UploadResponse
+from backend.models.schemas import UploadResponse, VisualizationResponse
+from backend.routers.visualize import visualization_urls
+from backend.services.audio_pipeline import generate_visualizations
 from backend.utils.audio_converter import get_audio_info
 from backend.utils.file_manager import (
     generate_file_id,
+    track_file,
     uploaded_path,
     validate_extension,
     validate_file_size,
@@ -21,15 +25,23 @@ from backend.utils.file_manager import (
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["Upload"])
 
+_CHUNK_SIZE = 1 << 20  # 1 MiB per read while streaming to disk
+
 
 @router.post("/upload", response_model=UploadResponse)
-async def upload_audio(file: UploadFile = File(...)) -> UploadResponse:
+async def upload_audio(
+    file: UploadFile = File(...),
+    include_viz: bool = Form(False),
+) -> UploadResponse:
     """
     Upload an audio file (MP3, WAV, OGG, FLAC, M4A).
 
     - Validates extension and size.
-    - Saves with a UUID filename.
+    - Streams to disk under a UUID filename, aborting once the size
+      limit is exceeded.
     - Returns metadata about the uploaded audio.
+    - With ``include_viz``, also renders the original's waveform and
+      spectrogram and returns their URLs, saving a ``/visualize`` call.
     """
     if not file.filename:
         raise HTTPException(status_code=400, detail="No filename provided.")
@@ -40,18 +52,21 @@ async def upload_audio(file: UploadFile = File(...)) -> UploadResponse:
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
-    # --- validate size -------------------------------------------------------
-    contents = await file.read()
+    # --- stream to disk, validating size as we go ----------------------------
+    file_id = generate_file_id()
+    dest = uploaded_path(file_id, ext)
+    total = 0
     try:
-        validate_file_size(len(contents))
+        async with aiofiles.open(dest, "wb") as out:
+            while chunk := await file.read(_CHUNK_SIZE):
+                total += len(chunk)
+                validate_file_size(total)
+                await out.write(chunk)
     except ValueError as exc:
+        dest.unlink(missing_ok=True)
         raise HTTPException(status_code=413, detail=str(exc))
-
-    # --- save ----------------------------------------------------------------
-    file_id = generate_file_id()
-    dest = uploaded_path(file_id, ext)
-    dest.write_bytes(contents)
-    logger.info("Uploaded %s → %s (%d bytes)", file.filename, dest.name, len(contents))
+    track_file(dest)
+    logger.info("Uploaded %s → %s (%d bytes)", file.filename, dest.name, total)
 
     # --- metadata ------------------------------------------------------------
     try:
@@ -61,10 +76,21 @@ async def upload_audio(file: UploadFile = File(...)) -> UploadResponse:
         dest.unlink(missing_ok=True)
         raise HTTPException(status_code=422, detail=f"Cannot read audio file: {exc}")
 
+    # --- optional visualizations --------------------------------------------
+    viz = None
+    if include_viz:
+        try:
+            await asyncio.to_thread(generate_visualizations, file_id, "Original")
+            viz = VisualizationResponse(**visualization_urls(file_id))
+        except Exception:
+            # Not fatal: the client can still ask /visualize later
+            logger.exception("Visualization on upload failed for %s", file_id)
+
     return UploadResponse(
         file_id=file_id,
         filename=file.filename,
         duration_seconds=round(info["duration"], 2),
         sample_rate=info["sample_rate"],
         channels=info["channels"],
+        viz=viz,
     )
@@ -4,44 +4,86 @@ Visualization Router — serves waveform & spectrogram images.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Request, Response
 
 from backend.services.audio_pipeline import generate_visualizations
 from backend.utils.file_manager import visualization_path
+from backend.utils.http_cache import cached_file_response
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["Visualization"])
 
+# file_id → (lock, requests using it), so concurrent requests for the
+# same file wait for a single render instead of repeating it.  The last
+# request to leave drops the entry; until then, latecomers share the
+# same lock even if a render failed and the next waiter is retrying.
+_render_locks: dict[str, tuple[asyncio.Lock, int]] = {}
+
+
+def _visualizations_exist(file_id: str) -> bool:
+    return (
+        visualization_path(file_id, "waveform").exists()
+        and visualization_path(file_id, "spectrogram").exists()
+    )
+
+
+async def _ensure_visualizations(file_id: str, label: str = "") -> None:
+    """Render both images for *file_id* unless they are already on disk."""
+    if _visualizations_exist(file_id):
+        return
+    lock, users = _render_locks.get(file_id, (None, 0))
+    if lock is None:
+        lock = asyncio.Lock()
+    _render_locks[file_id] = (lock, users + 1)
+    try:
+        async with lock:
+            if not _visualizations_exist(file_id):
+                await asyncio.to_thread(generate_visualizations, file_id, label)
+    finally:
+        lock, users = _render_locks[file_id]
+        if users == 1:
+            del _render_locks[file_id]
+        else:
+            _render_locks[file_id] = (lock, users - 1)
+
+
+def visualization_urls(file_id: str) -> dict:
+    """URLs of the waveform and spectrogram images for *file_id*."""
+    return {
+        "file_id": file_id,
+        "waveform_url": f"/visualize/image/{file_id}/waveform",
+        "spectrogram_url": f"/visualize/image/{file_id}/spectrogram",
+    }
+
 
 @router.get("/visualize/{file_id}")
 async def visualize(file_id: str, label: str = "") -> dict:
     """
     Generate and return URLs for waveform + spectrogram images.
+
+    Images already on disk are reused rather than re-rendered.
     """
     try:
-        paths = generate_visualizations(file_id, label=label)
+        await _ensure_visualizations(file_id, label)
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc))
     except Exception as exc:
         logger.exception("Visualization failed for %s", file_id)
         raise HTTPException(status_code=500, detail=str(exc))
 
-    return {
-        "file_id": file_id,
-        "waveform_url": f"/visualize/image/{file_id}/waveform",
-        "spectrogram_url": f"/visualize/image/{file_id}/spectrogram",
-    }
+    return visualization_urls(file_id)
 
 
 @router.get("/visualize/image/{file_id}/{kind}")
-async def get_visualization_image(file_id: str, kind: str) -> FileResponse:
+async def get_visualization_image(file_id: str, kind: str, request: Request) -> Response:
     """
     Serve a generated visualization image.
 
-    ``kind`` must be ``'waveform'`` or ``'spectrogram'``.
+    ``kind`` must be ``'waveform'`` or ``'spectrogram'``.  Supports
+    conditional GETs via ``ETag`` / ``If-None-Match``.
     """
     if kind not in ("waveform", "spectrogram"):
         raise HTTPException(status_code=400, detail="kind must be 'waveform' or 'spectrogram'")
@@ -50,11 +92,11 @@ async def get_visualization_image(file_id: str, kind: str) -> FileResponse:
     if not path.exists():
         # Try generating on the fly
         try:
-            generate_visualizations(file_id)
+            await _ensure_visualizations(file_id)
         except Exception:
             raise HTTPException(status_code=404, detail="Visualization not found")
 
     if not path.exists():
         raise HTTPException(status_code=404, detail="Visualization not found")
 
-    return FileResponse(path=str(path), media_type="image/png")
+    return cached_file_response(request, path, media_type="image/png")
@@ -3,31 +3,47 @@ Audio Effects Service — pure DSP functions.
 
 Every function here is **pure**: it takes a numpy signal + sample rate,
 returns a transformed numpy signal.  No file I/O, no HTTP, no side-effects.
+
+librosa, scipy and the Numba kernels are imported inside the functions
+that need them, so importing this module (and hence starting the API)
+does not pay their multi-hundred-millisecond import cost.
 """
 
 from __future__ import annotations
 
+import functools
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 
-import librosa
 import numpy as np
-from scipy.signal import fftconvolve
 
 logger = logging.getLogger(__name__)
 
+# Shared worker pool for per-channel work that releases the GIL
+_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+
 
 # ==========================================================================
 # Normalisation (shared utility)
 # ==========================================================================
 
-def peak_normalize(signal: np.ndarray, target_peak: float = 0.95) -> np.ndarray:
+def peak_normalize(
+    signal: np.ndarray,
+    target_peak: float = 0.95,
+    peak: float | None = None,
+) -> np.ndarray:
     """
     Peak-normalise *signal* so its maximum absolute value equals *target_peak*.
 
-    Prevents clipping while maximising loudness.
+    Prevents clipping while maximising loudness.  Pass *peak* when it is
+    already known (e.g. from a fused kernel) to skip the reduction.
+    Signals already at *target_peak* are returned as-is, without a copy.
     """
-    peak = np.max(np.abs(signal))
-    if peak == 0:
+    if peak is None:
+        # Two reductions instead of materialising np.abs(signal)
+        peak = max(float(signal.max()), -float(signal.min()))
+    if peak == 0 or abs(peak - target_peak) < 1e-4:
         return signal
     return signal * (target_peak / peak)
 
@@ -41,18 +57,61 @@ def reverse_audio(signal: np.ndarray, sr: int) -> np.ndarray:
     Reverse the audio signal along the time axis.
 
     Handles both mono ``(samples,)`` and stereo ``(2, samples)`` layouts.
+    Returns a negative-stride *view* — no samples are copied.  Downstream
+    writers (``soundfile.write``) make the data contiguous themselves.
     """
     logger.info("Applying: Reverse Audio")
-    if signal.ndim == 1:
-        return signal[::-1].copy()
-    # Stereo — reverse along the samples axis (axis=1)
-    return signal[:, ::-1].copy()
+    # Reverse along the samples axis (last axis for mono and stereo)
+    return signal[..., ::-1]
 
 
 # ==========================================================================
 # 2. Pitch Shift
 # ==========================================================================
 
+def _pv_shift(
+    signal2d: np.ndarray,
+    n_steps: float,
+    n_fft: int = 2048,
+    hop: int = 512,
+) -> np.ndarray:
+    """
+    Phase-vocoder pitch shift of a ``(channels, samples)`` array.
+
+    Time-stretches by ``2 ** (n_steps / 12)`` with the compiled phase
+    vocoder, then linearly resamples back to the original length.  The
+    FFTs run batched in numpy; per-frame loops run in ``dsp_kernels``.
+    """
+    from backend.services import dsp_kernels
+
+    n_ch, n_samples = signal2d.shape
+    ratio = 2.0 ** (n_steps / 12.0)
+
+    # Periodic Hann window
+    window = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(n_fft) / n_fft)
+
+    # Centred STFT over all channels at once
+    padded = np.pad(signal2d, ((0, 0), (n_fft // 2, n_fft // 2)))
+    frames = np.lib.stride_tricks.sliding_window_view(padded, n_fft, axis=-1)[:, ::hop]
+    spec = np.fft.rfft(frames * window, axis=-1)
+    n_frames, n_bins = spec.shape[1], spec.shape[2]
+
+    # Two trailing zero frames keep the interpolation in bounds
+    mag = np.pad(np.abs(spec), ((0, 0), (0, 2), (0, 0)))
+    phase = np.pad(np.angle(spec), ((0, 0), (0, 2), (0, 0)))
+    time_steps = np.arange(0, n_frames, 1.0 / ratio)
+    phi_advance = np.linspace(0, np.pi * hop, n_bins)
+
+    stretched_spec = dsp_kernels.pv_advance(mag, phase, time_steps, phi_advance)
+    stretched_frames = np.fft.irfft(stretched_spec, n=n_fft, axis=-1)
+    stretched = dsp_kernels.overlap_add(stretched_frames, window, hop)
+
+    # Drop the centre padding, then squeeze back to the original duration
+    stretched_len = int(round(n_samples * ratio))
+    stretched = stretched[:, n_fft // 2 : n_fft // 2 + stretched_len]
+    return dsp_kernels.linear_resample(np.ascontiguousarray(stretched), n_samples)
+
+
 def pitch_shift(
     signal: np.ndarray,
     sr: int,
@@ -61,18 +120,33 @@ def pitch_shift(
     """
     Shift pitch by *semitones* while preserving duration.
 
-    Uses ``librosa.effects.pitch_shift``.
+    Uses a Numba-compiled phase vocoder that processes all channels in
+    one pass, falling back to ``librosa.effects.pitch_shift`` when numba
+    is not installed.
     """
+    from backend.services import dsp_kernels
+
     logger.info("Applying: Pitch Shift (%+.1f semitones)", semitones)
+    if not dsp_kernels.HAVE_NUMBA:
+        import librosa
+
+        # soxr is far cheaper than the default kaiser_best resampler.
+        def _shift(y: np.ndarray) -> np.ndarray:
+            return librosa.effects.pitch_shift(
+                y=y, sr=sr, n_steps=semitones, res_type="soxr_hq",
+            )
+
+        if signal.ndim == 1:
+            shifted = _shift(signal)
+        else:
+            # librosa releases the GIL in its FFTs, so channels overlap
+            shifted = np.stack(list(_POOL.map(_shift, signal)), axis=0)
+        return peak_normalize(shifted)
+
     if signal.ndim == 1:
-        shifted = librosa.effects.pitch_shift(y=signal, sr=sr, n_steps=semitones)
+        shifted = _pv_shift(signal[np.newaxis, :], semitones)[0]
     else:
-        # Process each channel independently
-        channels = [
-            librosa.effects.pitch_shift(y=signal[ch], sr=sr, n_steps=semitones)
-            for ch in range(signal.shape[0])
-        ]
-        shifted = np.stack(channels, axis=0)
+        shifted = _pv_shift(signal, semitones)
     return peak_normalize(shifted)
 
 
@@ -92,37 +166,26 @@ def reverb(
     Algorithm
     ---------
     1. Compute delay in samples.
-    2. Create a delayed copy scaled by *decay*.
-    3. Add multiple reflections (up to 5) with exponentially decreasing gain.
-    4. Mix with original and peak-normalise.
+    2. Build a sparse impulse response with a spike every *delay* samples,
+       weighted by exponentially decreasing gain (up to 5 reflections).
+    3. Convolve the signal with it in a single batched FFT pass.
+    4. Peak-normalise.
     """
+    from scipy.signal import fftconvolve
+
     logger.info("Applying: Reverb (decay=%.2f, delay=%dms)", decay, delay_ms)
     delay_samples = int(sr * delay_ms / 1000)
     num_reflections = 5
 
-    if signal.ndim == 1:
-        out_length = len(signal) + delay_samples * num_reflections
-        output = np.zeros(out_length, dtype=np.float32)
-        output[: len(signal)] = signal
-        for i in range(1, num_reflections + 1):
-            offset = delay_samples * i
-            gain = decay ** i
-            end = offset + len(signal)
-            if end > out_length:
-                end = out_length
-            output[offset:end] += signal[: end - offset] * gain
-    else:
-        channels, length = signal.shape
-        out_length = length + delay_samples * num_reflections
-        output = np.zeros((channels, out_length), dtype=np.float32)
-        output[:, :length] = signal
-        for i in range(1, num_reflections + 1):
-            offset = delay_samples * i
-            gain = decay ** i
-            end = offset + length
-            if end > out_length:
-                end = out_length
-            output[:, offset:end] += signal[:, : end - offset] * gain
+    impulse = np.zeros(delay_samples * num_reflections + 1, dtype=np.float32)
+    impulse[0] = 1.0
+    for i in range(1, num_reflections + 1):
+        impulse[i * delay_samples] += decay ** i
+
+    if signal.ndim == 2:
+        impulse = impulse[np.newaxis, :]
+    output = fftconvolve(signal, impulse, mode="full", axes=-1)
+    output = output.astype(np.float32, copy=False)
 
     return peak_normalize(output)
 
@@ -151,34 +214,31 @@ def stereo_widen(
         "Applying: Stereo Widen (delay=%dms, gain_diff=%.1fdB)",
         delay_ms, gain_diff_db,
     )
-    # Ensure stereo
+    # Ensure stereo (mono feeds both sides without stacking a copy)
     if signal.ndim == 1:
-        signal = np.stack([signal, signal.copy()], axis=0)
+        left = right = signal
+    else:
+        left, right = signal[0], signal[1]
 
     delay_samples = int(sr * delay_ms / 1000)
     gain_factor = 10 ** (-gain_diff_db / 20)
+    n = left.shape[0]
+
+    # Single output buffer: left padded at the end, right delayed
+    # (prepended zeros) and attenuated by the gain diff.
+    output = np.zeros((2, n + delay_samples), dtype=np.float32)
+    output[0, :n] = left
+    np.multiply(right, gain_factor, out=output[1, delay_samples:])
+
+    # Mid/side in place; side is boosted slightly for a wider image
+    # (1.3 × the usual half-difference).
+    side = np.subtract(output[0], output[1])
+    side *= 0.65
+    np.add(output[0], output[1], out=output[0])
+    output[0] *= 0.5                              # row 0 now holds mid
+    np.subtract(output[0], side, out=output[1])   # right = mid - side
+    output[0] += side                             # left  = mid + side
 
-    left = signal[0]
-    right = signal[1]
-
-    # Apply delay to right channel (prepend zeros)
-    right_delayed = np.concatenate([np.zeros(delay_samples, dtype=np.float32), right])
-    # Pad left to match length
-    left_padded = np.concatenate([left, np.zeros(delay_samples, dtype=np.float32)])
-
-    # Apply slight gain diff
-    right_delayed *= gain_factor
-
-    # Apply subtle phase inversion on a portion for widening feel
-    mid = (left_padded + right_delayed) / 2
-    side = (left_padded - right_delayed) / 2
-    # Boost side signal slightly for wider image
-    side *= 1.3
-
-    new_left = mid + side
-    new_right = mid - side
-
-    output = np.stack([new_left, new_right], axis=0)
     return peak_normalize(output)
 
 
@@ -252,6 +312,8 @@ def eight_d_audio(
     4. Add crossfeed so the pan isn't 100% hard (more natural).
     5. Peak-normalise.
 
+    With numba available, steps 2–5 run as one fused per-sample kernel.
+
     Parameters
     ----------
     pan_speed_hz : float
@@ -261,6 +323,8 @@ def eight_d_audio(
     crossfeed : float
         How much of each channel bleeds into the other (0.0–0.6).
     """
+    from backend.services import dsp_kernels
+
     logger.info(
         "Applying: 8D Audio (speed=%.2fHz, intensity=%.1f, crossfeed=%.1f)",
         pan_speed_hz, intensity, crossfeed,
@@ -268,7 +332,15 @@ def eight_d_audio(
 
     # Ensure stereo
     if signal.ndim == 1:
-        signal = np.stack([signal, signal.copy()], axis=0)
+        signal = np.stack([signal, signal], axis=0)
+
+    if dsp_kernels.HAVE_NUMBA:
+        output = np.empty((2, signal.shape[1]), dtype=np.float32)
+        peak = dsp_kernels.eight_d_pan(
+            signal[0], signal[1], output, sr,
+            pan_speed_hz, intensity, crossfeed, dsp_kernels.SINE_TABLE,
+        )
+        return peak_normalize(output, peak=peak)
 
     num_samples = signal.shape[1]
 
@@ -280,22 +352,21 @@ def eight_d_audio(
     pan_curve = 0.5 + intensity * (pan_curve - 0.5)
 
     # Compute per-channel gains using equal-power panning law
-    right_gain = np.sqrt(pan_curve)
-    left_gain = np.sqrt(1.0 - pan_curve)
+    gains = np.stack([np.sqrt(1.0 - pan_curve), np.sqrt(pan_curve)], axis=0)
 
-    # Mix original stereo content (center it first)
-    mono_mix = (signal[0] + signal[1]) / 2.0
-
-    # Apply panning
-    left_out = mono_mix * left_gain
-    right_out = mono_mix * right_gain
-
-    # Add crossfeed for more natural feel
+    # Add crossfeed for more natural feel.  Crossfeed is linear, so it
+    # folds into the gains as a 2×2 mix (both sides from pre-crossfeed
+    # values) before they touch the audio.
     if crossfeed > 0:
-        left_out = left_out * (1.0 - crossfeed) + right_out * crossfeed
-        right_out = right_out * (1.0 - crossfeed) + left_out * crossfeed
+        mix = np.array(
+            [[1.0 - crossfeed, crossfeed], [crossfeed, 1.0 - crossfeed]],
+            dtype=np.float32,
+        )
+        gains = mix @ gains
 
-    output = np.stack([left_out, right_out], axis=0)
+    # Mix original stereo content (center it first), then pan
+    mono_mix = (signal[0] + signal[1]) / 2.0
+    output = gains * mono_mix
     return peak_normalize(output)
 
 
@@ -303,6 +374,82 @@ def eight_d_audio(
 # 7. Equalizer (Parametric Biquad)
 # ==========================================================================
 
+# Standard EQ band centre frequencies
+_EQ_BANDS: dict[str, float] = {
+    "sub_bass": 60.0,
+    "bass": 170.0,
+    "low_mid": 500.0,
+    "mid": 1000.0,
+    "high_mid": 3000.0,
+    "presence": 6000.0,
+    "brilliance": 12000.0,
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def _peaking_eq_sos(freq: float, gain_db: float, q: float, fs: int) -> np.ndarray:
+    """Design a peaking EQ second-order section (cached, read-only)."""
+    A = 10 ** (gain_db / 40.0)
+    w0 = 2 * np.pi * freq / fs
+    alpha = np.sin(w0) / (2.0 * q)
+
+    b0 = 1 + alpha * A
+    b1 = -2 * np.cos(w0)
+    b2 = 1 - alpha * A
+    a0 = 1 + alpha / A
+    a1 = -2 * np.cos(w0)
+    a2 = 1 - alpha / A
+
+    # Normalise
+    sos = np.array([b0 / a0, b1 / a0, b2 / a0, 1.0, a1 / a0, a2 / a0])
+    sos.flags.writeable = False
+    return sos
+
+
+@functools.lru_cache(maxsize=256)
+def _design_eq_sos(
+    sr: int, band_gains: tuple[tuple[str, float], ...]
+) -> np.ndarray | None:
+    """
+    Design the cascaded SOS array for a set of (quantised) band gains.
+
+    Cached because designs are deterministic and the same slider
+    settings recur across requests.  Returns ``None`` when every band is
+    flat.  The returned array is read-only — it is shared between calls.
+    """
+    gains = dict(band_gains)
+    sos_sections = []
+    for band_name, centre_freq in _EQ_BANDS.items():
+        gain = gains.get(band_name, 0.0)
+        if abs(gain) < 0.01:
+            continue  # skip flat bands for efficiency
+        # Clamp frequency to Nyquist
+        if centre_freq >= sr / 2:
+            continue
+        sos_sections.append(_peaking_eq_sos(centre_freq, gain, q=1.4, fs=sr))
+
+    if not sos_sections:
+        return None
+
+    sos_array = np.array(sos_sections)
+    sos_array.flags.writeable = False
+    return sos_array
+
+
+def design_eq(sr: int, band_gains_db: dict[str, float]) -> np.ndarray | None:
+    """
+    Return the cascaded SOS :func:`equalizer` applies for *band_gains_db*.
+
+    ``None`` means every band is flat, in which case :func:`equalizer`
+    returns its input unfiltered and un-normalised.
+    """
+    # Quantise to 0.1 dB so near-identical settings share cached designs
+    quantized = tuple(
+        sorted((band, round(float(gain), 1)) for band, gain in band_gains_db.items())
+    )
+    return _design_eq_sos(sr, quantized)
+
+
 def equalizer(
     signal: np.ndarray,
     sr: int,
@@ -330,68 +477,34 @@ def equalizer(
         Mapping of band name → gain in dB.  Bands not specified
         default to 0 dB (no change).
     """
-    from scipy.signal import sosfilt
-
-    # Standard EQ band centre frequencies
-    BANDS: dict[str, float] = {
-        "sub_bass": 60.0,
-        "bass": 170.0,
-        "low_mid": 500.0,
-        "mid": 1000.0,
-        "high_mid": 3000.0,
-        "presence": 6000.0,
-        "brilliance": 12000.0,
-    }
+    from backend.services import dsp_kernels
 
     if band_gains_db is None:
         band_gains_db = {}
 
     logger.info("Applying: Equalizer — gains=%s", band_gains_db)
 
-    def _peaking_eq_sos(
-        freq: float, gain_db: float, q: float, fs: int
-    ) -> np.ndarray:
-        """Design a peaking EQ second-order section."""
-        A = 10 ** (gain_db / 40.0)
-        w0 = 2 * np.pi * freq / fs
-        alpha = np.sin(w0) / (2.0 * q)
-
-        b0 = 1 + alpha * A
-        b1 = -2 * np.cos(w0)
-        b2 = 1 - alpha * A
-        a0 = 1 + alpha / A
-        a1 = -2 * np.cos(w0)
-        a2 = 1 - alpha / A
-
-        # Normalise
-        return np.array([b0 / a0, b1 / a0, b2 / a0, 1.0, a1 / a0, a2 / a0])
-
-    # Build cascaded SOS array
-    sos_sections = []
-    for band_name, centre_freq in BANDS.items():
-        gain = band_gains_db.get(band_name, 0.0)
-        if abs(gain) < 0.01:
-            continue  # skip flat bands for efficiency
-        # Clamp frequency to Nyquist
-        if centre_freq >= sr / 2:
-            continue
-        sos = _peaking_eq_sos(centre_freq, gain, q=1.4, fs=sr)
-        sos_sections.append(sos)
-
-    if not sos_sections:
+    sos_array = design_eq(sr, band_gains_db)
+    if sos_array is None:
         logger.info("All EQ bands flat — returning original signal")
         return signal.copy()
 
-    sos_array = np.array(sos_sections)
+    if dsp_kernels.HAVE_NUMBA:
+        # Compiled cascade over all channels, biquad state kept in registers
+        if signal.ndim == 1:
+            output = dsp_kernels.biquad_cascade(signal[np.newaxis, :], sos_array)[0]
+        else:
+            output = dsp_kernels.biquad_cascade(signal, sos_array)
+        return peak_normalize(output)
 
-    # Apply to each channel
-    if signal.ndim == 1:
-        output = sosfilt(sos_array, signal).astype(np.float32)
-    else:
-        channels = []
-        for ch in range(signal.shape[0]):
-            filtered = sosfilt(sos_array, signal[ch]).astype(np.float32)
-            channels.append(filtered)
-        output = np.stack(channels, axis=0)
+    from scipy.signal import sosfilt
+
+    # float32 coefficients keep sosfilt in single precision end-to-end,
+    # so there is no float64 intermediate to cast back.
+    sos_f32 = sos_array.astype(np.float32)
+    signal = signal.astype(np.float32, copy=False)
+
+    # One call filters every channel along the samples axis
+    output = sosfilt(sos_f32, signal, axis=-1)
 
     return peak_normalize(output)
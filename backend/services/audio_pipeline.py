@@ -1,8 +1,9 @@
 """
 Audio Pipeline — orchestrates the full processing workflow.
 
-    Upload MP3 → convert to WAV → load → apply effect → normalise
-    → save WAV → convert to MP3 → return processed file_id.
+    Upload MP3 → decode (cached in RAM) → apply effect → normalise
+    → encode MP3 (+ render visualizations, concurrently)
+    → return processed file_id.
 
 This module is the **only** place where file I/O and DSP logic meet.
 Routers call the pipeline; the pipeline calls services and utils.
@@ -10,13 +11,26 @@ Routers call the pipeline; the pipeline calls services and utils.
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+import os
 import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 
 import numpy as np
+from pydantic import BaseModel
 
-from backend.config import PROCESSED_DIR, UPLOAD_DIR
+from backend.config import (
+    DECODE_CACHE_SIZE,
+    PROCESSED_DIR,
+    RESULT_MEMO_SIZE,
+    UPLOAD_DIR,
+)
 from backend.models.schemas import (
     EffectName,
     EightDAudioParams,
@@ -28,6 +42,7 @@ from backend.models.schemas import (
     TrimParams,
 )
 from backend.services.audio_effects import (
+    design_eq,
     eight_d_audio,
     equalizer,
     peak_normalize,
@@ -38,16 +53,14 @@ from backend.services.audio_effects import (
     trim_audio,
 )
 from backend.services.visualization import generate_spectrogram, generate_waveform
-from backend.utils.audio_converter import (
-    load_audio,
-    mp3_to_wav,
-    save_audio,
-    wav_to_mp3,
-)
+from backend.utils.audio_cache import load_cached
+from backend.utils.audio_converter import encode_mp3, save_audio
 from backend.utils.file_manager import (
     generate_file_id,
     processed_path,
+    track_file,
     uploaded_path,
+    visualization_path,
     wav_path_for,
 )
 
@@ -58,6 +71,68 @@ logger = logging.getLogger(__name__)
 # Effect dispatcher
 # ---------------------------------------------------------------------------
 
+def _equalize(signal: np.ndarray, sr: int, **band_gains_db: float) -> np.ndarray:
+    """Adapter: :func:`equalizer` takes its band gains as one dict."""
+    return equalizer(signal, sr, band_gains_db=band_gains_db)
+
+
+_EQ_PARAM_NAMES: tuple[str, ...] = (
+    "sub_bass", "bass", "low_mid", "mid", "high_mid", "presence", "brilliance",
+)
+
+# effect → (parameter model, effect function, keyword arguments it takes).
+# Built once at import so dispatch is a dict lookup; REVERSE takes no
+# parameters and skips validation altogether.
+_DISPATCH: dict[
+    EffectName,
+    tuple[type[BaseModel] | None, Callable[..., np.ndarray], tuple[str, ...]],
+] = {
+    EffectName.REVERSE: (None, reverse_audio, ()),
+    EffectName.PITCH_SHIFT: (PitchShiftParams, pitch_shift, ("semitones",)),
+    EffectName.REVERB: (ReverbParams, reverb, ("decay", "delay_ms")),
+    EffectName.STEREO_WIDEN: (
+        StereoWidenParams, stereo_widen, ("delay_ms", "gain_diff_db"),
+    ),
+    EffectName.TRIM: (TrimParams, trim_audio, ("start_time", "end_time")),
+    EffectName.EIGHT_D_AUDIO: (
+        EightDAudioParams, eight_d_audio, ("pan_speed_hz", "intensity", "crossfeed"),
+    ),
+    EffectName.EQUALIZER: (EqualizerParams, _equalize, _EQ_PARAM_NAMES),
+}
+
+
+def _bind_effect(
+    effect: EffectName,
+    params: dict,
+) -> Callable[[np.ndarray, int], np.ndarray]:
+    """
+    Validate *params* for *effect* and bind them to its effect function.
+
+    Returns a callable taking ``(signal, sr)``.
+
+    Raises:
+        ValueError: For an unknown effect or invalid parameters
+            (pydantic's ``ValidationError`` is a ``ValueError``).
+    """
+    fn, kwargs = _effect_kwargs(effect, params)
+    return partial(fn, **kwargs) if kwargs else fn
+
+
+def _effect_kwargs(
+    effect: EffectName,
+    params: dict,
+) -> tuple[Callable[..., np.ndarray], dict]:
+    """Validate *params* and return ``(effect function, keyword arguments)``."""
+    try:
+        model_cls, fn, names = _DISPATCH[effect]
+    except KeyError:
+        raise ValueError(f"Unknown effect: {effect}") from None
+    if model_cls is None:
+        return fn, {}
+    validated = model_cls.model_validate(params)
+    return fn, {name: getattr(validated, name) for name in names}
+
+
 def _apply_effect(
     signal: np.ndarray,
     sr: int,
@@ -69,152 +144,408 @@ def _apply_effect(
 
     Returns the processed signal (numpy array).
     """
-    match effect:
-        case EffectName.REVERSE:
-            return reverse_audio(signal, sr)
+    return _bind_effect(effect, params)(signal, sr)
 
-        case EffectName.PITCH_SHIFT:
-            validated = PitchShiftParams(**params)
-            return pitch_shift(signal, sr, semitones=validated.semitones)
 
-        case EffectName.REVERB:
-            validated = ReverbParams(**params)
-            return reverb(signal, sr, decay=validated.decay, delay_ms=validated.delay_ms)
+# Effects that treat every row independently along the samples axis, so
+# equal-shape signals can be stacked and run as a single call.
+_STACKABLE_EFFECTS: frozenset[EffectName] = frozenset({
+    EffectName.REVERSE,
+    EffectName.TRIM,
+    EffectName.EQUALIZER,
+})
 
-        case EffectName.STEREO_WIDEN:
-            validated = StereoWidenParams(**params)
-            return stereo_widen(
-                signal, sr,
-                delay_ms=validated.delay_ms,
-                gain_diff_db=validated.gain_diff_db,
-            )
 
-        case EffectName.TRIM:
-            validated = TrimParams(**params)
-            return trim_audio(signal, sr, start_time=validated.start_time, end_time=validated.end_time)
-
-        case EffectName.EIGHT_D_AUDIO:
-            validated = EightDAudioParams(**params)
-            return eight_d_audio(
-                signal, sr,
-                pan_speed_hz=validated.pan_speed_hz,
-                intensity=validated.intensity,
-                crossfeed=validated.crossfeed,
-            )
+@lru_cache(maxsize=1)
+def _batch_pool() -> ThreadPoolExecutor:
+    """
+    Worker pool for unstackable batch effects, created on first use.
+
+    Separate from audio_effects' per-channel pool: batch jobs may submit
+    into that one, and sharing it could leave every worker waiting.
+    """
+    return ThreadPoolExecutor(max_workers=os.cpu_count())
+
+
+def _apply_effect_batch(
+    signals: list[np.ndarray],
+    sr: int,
+    effect: EffectName,
+    params: dict,
+) -> list[np.ndarray]:
+    """
+    Apply one effect with one parameter set to several signals.
+
+    Parameters are validated once.  Row-wise effects on equal-shape
+    signals run as one call over the stacked ``(batch, channels,
+    samples)`` array; everything else runs per signal on a thread pool.
+
+    Returns:
+        Processed signals, in input order — each equal to what
+        :func:`_apply_effect` returns for it alone.
+    """
+    fn, kwargs = _effect_kwargs(effect, params)
+    if kwargs:
+        fn = partial(fn, **kwargs)
+    if not signals:
+        return []
+
+    shape = signals[0].shape
+    if effect in _STACKABLE_EFFECTS and all(s.shape == shape for s in signals):
+        stacked = np.stack(signals).reshape(-1, shape[-1])
+        out = fn(stacked, sr)
+        out = out.reshape(len(signals), *shape[:-1], out.shape[-1])
+        # A filtering EQ normalised the whole stack by one peak; redo it
+        # per signal.  An all-flat EQ returns its input untouched.
+        if effect is EffectName.EQUALIZER and design_eq(sr, kwargs) is not None:
+            return [peak_normalize(o) for o in out]
+        return list(out)
+
+    return list(_batch_pool().map(lambda s: fn(s, sr), signals))
+
+
+# ---------------------------------------------------------------------------
+# Decoded-source cache
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=DECODE_CACHE_SIZE)
+def _decode_cached(path: Path, mtime_ns: int) -> tuple[np.ndarray, int]:
+    """Load *path* once per modification time; see :func:`decode_mp3`."""
+    return load_cached(path.stem, path.parent)
 
-        case EffectName.EQUALIZER:
-            validated = EqualizerParams(**params)
-            band_gains = {
-                "sub_bass": validated.sub_bass,
-                "bass": validated.bass,
-                "low_mid": validated.low_mid,
-                "mid": validated.mid,
-                "high_mid": validated.high_mid,
-                "presence": validated.presence,
-                "brilliance": validated.brilliance,
-            }
-            return equalizer(signal, sr, band_gains_db=band_gains)
 
-        case _:
-            raise ValueError(f"Unknown effect: {effect}")
+def decode_mp3(path: Path) -> tuple[np.ndarray, int]:
+    """
+    Decode an uploaded MP3 to float32, reusing recent decodes.
+
+    Repeat effect requests on the same upload hit RAM; a fresh process
+    maps the on-disk PCM cache instead of decoding.  The returned array
+    is read-only — effects must not write into their input.
+    """
+    return _decode_cached(path, path.stat().st_mtime_ns)
+
+
+# ---------------------------------------------------------------------------
+# Result memo
+# ---------------------------------------------------------------------------
+
+# (file_id, effect, validated parameters) → (processed_file_id,
+# content_sha256) of the last identical request.  Uploads never change
+# under a file_id, so an identical request can hand back the earlier
+# output while it exists.  Only touched from the event loop, so it
+# needs no lock.
+_RESULT_MEMO: OrderedDict[tuple, tuple[str, str]] = OrderedDict()
+
+# content_sha256 → processed_file_id of the latest output with that PCM.
+# Different requests that render the same samples (e.g. a flat EQ and a
+# full-length trim) share one MP3 and one set of plots.
+_OUTPUT_BY_DIGEST: OrderedDict[str, str] = OrderedDict()
+
+
+def _request_key(file_id: str, effect: EffectName, parameters: dict) -> tuple:
+    """Memo key with parameters normalised by their pydantic model."""
+    _, kwargs = _effect_kwargs(effect, parameters)
+    return file_id, effect, tuple(sorted(kwargs.items()))
+
+
+def _outputs_exist(proc_id: str, visualize: bool) -> bool:
+    """``True`` while *proc_id*'s MP3 (and plots, if wanted) are on disk."""
+    return processed_path(proc_id, ".mp3").exists() and (
+        not visualize or all(
+            visualization_path(proc_id, kind).exists()
+            for kind in ("waveform", "spectrogram")
+        )
+    )
+
+
+def _memo_lookup(key: tuple, visualize: bool) -> tuple[str, str] | None:
+    """Return the memoised ``(output id, digest)`` if its files still exist."""
+    hit = _RESULT_MEMO.get(key)
+    if hit is None:
+        return None
+    if not _outputs_exist(hit[0], visualize):
+        del _RESULT_MEMO[key]  # expired, or rendered without plots
+        return None
+    _RESULT_MEMO.move_to_end(key)
+    return hit
+
+
+def _digest_lookup(digest: str, visualize: bool) -> str | None:
+    """Return an earlier output id with PCM *digest*, if its files exist."""
+    proc_id = _OUTPUT_BY_DIGEST.get(digest)
+    if proc_id is None:
+        return None
+    if not _outputs_exist(proc_id, visualize):
+        del _OUTPUT_BY_DIGEST[digest]
+        return None
+    _OUTPUT_BY_DIGEST.move_to_end(digest)
+    return proc_id
+
+
+def _lru_put(cache: OrderedDict, key, value) -> None:
+    """Insert *key* as most recently used, evicting past ``RESULT_MEMO_SIZE``."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > RESULT_MEMO_SIZE:
+        cache.popitem(last=False)
+
+
+def _memo_store(key: tuple, proc_id: str, digest: str) -> None:
+    """Remember the output for *key* and for its digest."""
+    _lru_put(_RESULT_MEMO, key, (proc_id, digest))
+    _lru_put(_OUTPUT_BY_DIGEST, digest, proc_id)
 
 
 # ---------------------------------------------------------------------------
 # Full pipeline
 # ---------------------------------------------------------------------------
 
-def process_audio(
+def _decode_upload(file_id: str) -> tuple[np.ndarray, int]:
+    """Locate and decode the uploaded MP3 for *file_id* (steps 1–2)."""
+    # 1. Locate source
+    source_mp3 = uploaded_path(file_id, ".mp3")
+    if not source_mp3.exists():
+        raise FileNotFoundError(f"Uploaded file not found: {file_id}")
+
+    # 2. Decode MP3 (all effects work in float32)
+    return decode_mp3(source_mp3)
+
+
+def _render_effect(
+    file_id: str,
+    effect: EffectName,
+    parameters: dict,
+) -> tuple[np.ndarray, int]:
+    """Decode the upload, apply *effect* and peak-normalise (steps 1–4)."""
+    signal, sr = _decode_upload(file_id)
+
+    # 3. Apply effect
+    processed_signal = _apply_effect(signal, sr, effect, parameters)
+
+    # 4. Normalise
+    return peak_normalize(processed_signal), sr
+
+
+def _render_effect_batch(
+    file_ids: list[str],
+    effect: EffectName,
+    parameters: dict,
+) -> list[tuple[np.ndarray, int]]:
+    """Steps 1–4 for several uploads, batching those that share a rate."""
+    decoded = [_decode_upload(file_id) for file_id in file_ids]
+    by_rate: dict[int, list[int]] = {}
+    for i, (_, sr) in enumerate(decoded):
+        by_rate.setdefault(sr, []).append(i)
+
+    rendered: list[tuple[np.ndarray, int] | None] = [None] * len(decoded)
+    for sr, indices in by_rate.items():
+        outputs = _apply_effect_batch(
+            [decoded[i][0] for i in indices], sr, effect, parameters,
+        )
+        for i, out in zip(indices, outputs):
+            rendered[i] = peak_normalize(out), sr
+    return rendered
+
+
+def _content_digest(signal: np.ndarray, sr: int) -> str:
+    """SHA-256 of the rendered PCM, so equal outputs are recognisable."""
+    h = hashlib.sha256(f"{sr}:{signal.shape}:".encode())
+    h.update(np.ascontiguousarray(signal, dtype=np.float32).data)
+    return h.hexdigest()
+
+
+async def process_audio(
     file_id: str,
     effect: EffectName,
     parameters: dict,
+    keep_wav: bool = False,
+    visualize: bool = False,
 ) -> ProcessResponse:
     """
     Execute the full audio processing pipeline.
 
+    Audio stays in memory from decode to encode; no intermediate WAVs
+    are written unless *keep_wav* is set.  All blocking work runs in
+    worker threads, so the event loop keeps serving other requests.
+
     Steps
     -----
     1. Locate uploaded MP3.
-    2. Convert to WAV.
-    3. Load with librosa (preserving native sample rate).
-    4. Apply the requested effect.
-    5. Peak-normalise.
-    6. Save processed WAV.
-    7. Convert processed WAV back to MP3.
-    8. Return ``ProcessResponse``.
+    2. Decode it in-process (preserving native sample rate).
+    3. Apply the requested effect.
+    4. Peak-normalise.
+    5. Hash the processed PCM.  If an earlier output with the same hash
+       is still on disk, return it and skip the remaining steps.
+    6. Encode the processed signal straight to MP3 — concurrently with
+       saving the WAV (*keep_wav*) and rendering the waveform and
+       spectrogram (*visualize*).
+    7. Return ``ProcessResponse``, including the output's content hash.
+
+    A request identical to a recent one (same upload, effect and
+    validated parameters) returns the earlier output without rerunning
+    any of these steps.
     """
     t0 = time.perf_counter()
 
-    # 1. Locate source
-    source_mp3 = uploaded_path(file_id, ".mp3")
-    if not source_mp3.exists():
-        raise FileNotFoundError(f"Uploaded file not found: {file_id}")
+    key = _request_key(file_id, effect, parameters)
+    hit = _memo_lookup(key, visualize)
+    if hit is not None:
+        proc_id, digest = hit
+        logger.info("Reusing identical result — effect=%s, output=%s", effect.value, proc_id)
+        return _response(file_id, proc_id, effect, t0, digest)
 
-    # 2. Convert MP3 → WAV
-    source_wav = wav_path_for(file_id, UPLOAD_DIR)
-    if not source_wav.exists():
-        mp3_to_wav(source_mp3, source_wav)
+    processed_signal, sr = await asyncio.to_thread(
+        _render_effect, file_id, effect, parameters,
+    )
+    return await _finish_output(
+        file_id, key, effect, processed_signal, sr, t0, keep_wav, visualize,
+    )
 
-    # 3. Load audio
-    signal, sr = load_audio(source_wav, sr=None, mono=False)
 
-    # 4. Apply effect
-    processed_signal = _apply_effect(signal, sr, effect, parameters)
+async def process_audio_batch(
+    file_ids: list[str],
+    effect: EffectName,
+    parameters: dict,
+    visualize: bool = False,
+) -> list[ProcessResponse]:
+    """
+    Apply one effect with one parameter set to several uploads.
 
-    # 5. Normalise
-    processed_signal = peak_normalize(processed_signal)
+    Each upload goes through the same steps, memo and output reuse as
+    :func:`process_audio`, but step 3 runs once for the whole batch via
+    :func:`_apply_effect_batch`.
 
-    # 6. Save processed WAV
-    proc_id = generate_file_id()
-    proc_wav = wav_path_for(proc_id, PROCESSED_DIR)
-    save_audio(processed_signal, sr, proc_wav)
+    Returns:
+        One ``ProcessResponse`` per entry of *file_ids*, in order.
+    """
+    t0 = time.perf_counter()
 
-    # 7. Convert WAV → MP3
-    proc_mp3 = processed_path(proc_id, ".mp3")
-    wav_to_mp3(proc_wav, proc_mp3)
+    keys = [_request_key(file_id, effect, parameters) for file_id in file_ids]
+    responses: list[ProcessResponse | None] = [None] * len(file_ids)
+    misses: list[int] = []
+    for i, key in enumerate(keys):
+        hit = _memo_lookup(key, visualize)
+        if hit is None:
+            misses.append(i)
+        else:
+            responses[i] = _response(file_ids[i], hit[0], effect, t0, hit[1])
+
+    if misses:
+        rendered = await asyncio.to_thread(
+            _render_effect_batch, [file_ids[i] for i in misses], effect, parameters,
+        )
+        finished = await asyncio.gather(*(
+            _finish_output(
+                file_ids[i], keys[i], effect, signal, sr, t0,
+                keep_wav=False, visualize=visualize,
+            )
+            for i, (signal, sr) in zip(misses, rendered)
+        ))
+        for i, response in zip(misses, finished):
+            responses[i] = response
 
-    elapsed = time.perf_counter() - t0
+    logger.info(
+        "Batch complete — effect=%s, files=%d, rendered=%d, time=%.2fs",
+        effect.value, len(file_ids), len(misses), time.perf_counter() - t0,
+    )
+    return responses
+
+
+async def _finish_output(
+    file_id: str,
+    key: tuple,
+    effect: EffectName,
+    processed_signal: np.ndarray,
+    sr: int,
+    t0: float,
+    keep_wav: bool,
+    visualize: bool,
+) -> ProcessResponse:
+    """Hash, reuse or encode a rendered signal (steps 5–7)."""
+    # 5. Equal PCM means an equal MP3 and equal plots: reuse them
+    digest = await asyncio.to_thread(_content_digest, processed_signal, sr)
+    proc_id = None if keep_wav else _digest_lookup(digest, visualize)
+    if proc_id is not None:
+        logger.info("Reusing identical output — effect=%s, output=%s", effect.value, proc_id)
+        _memo_store(key, proc_id, digest)
+        return _response(file_id, proc_id, effect, t0, digest)
+
+    # 6. Encode MP3 from the in-memory signal; the other outputs only
+    # read the same array, so they run alongside it.
+    proc_id = generate_file_id()
+    proc_mp3 = processed_path(proc_id, ".mp3")
+    jobs = [asyncio.to_thread(encode_mp3, processed_signal, sr, proc_mp3)]
+    written = [proc_mp3]
+    if keep_wav:
+        proc_wav = wav_path_for(proc_id, PROCESSED_DIR)
+        jobs.append(asyncio.to_thread(save_audio, processed_signal, sr, proc_wav))
+        written.append(proc_wav)
+    if visualize:
+        jobs.append(asyncio.to_thread(
+            generate_waveform, processed_signal, sr, proc_id,
+            title=_viz_title("Waveform", "Processed"),
+        ))
+        jobs.append(asyncio.to_thread(
+            generate_spectrogram, processed_signal, sr, proc_id,
+            title=_viz_title("Spectrogram", "Processed"),
+        ))
+    await asyncio.gather(*jobs)
+    for path in written:  # plots are tracked by the visualization service
+        track_file(path)
+    _memo_store(key, proc_id, digest)
+
+    # 7. Respond
+    response = _response(file_id, proc_id, effect, t0, digest)
     logger.info(
         "Pipeline complete — effect=%s, time=%.2fs, output=%s",
-        effect.value, elapsed, proc_id,
+        effect.value, response.processing_time_seconds, proc_id,
     )
+    return response
 
+
+def _response(
+    file_id: str,
+    proc_id: str,
+    effect: EffectName,
+    t0: float,
+    digest: str,
+) -> ProcessResponse:
+    """Build the ``ProcessResponse`` for an output finished at *t0* + now."""
     return ProcessResponse(
         file_id=file_id,
         processed_file_id=proc_id,
         effect=effect.value,
-        processing_time_seconds=round(elapsed, 3),
+        processing_time_seconds=round(time.perf_counter() - t0, 3),
+        content_sha256=digest,
     )
 
 
+def _viz_title(kind: str, label: str) -> str:
+    """Plot title such as ``'Waveform — Processed'``."""
+    return f"{kind}{' — ' + label if label else ''}"
+
+
 def generate_visualizations(file_id: str, label: str = "") -> dict[str, Path]:
     """
     Generate waveform + spectrogram for a given file_id.
 
-    Looks in both upload and processed directories.
+    Looks in both upload and processed directories.  MP3s are decoded
+    straight into the PCM cache; no WAV is written for the plots.
 
     Returns:
         ``{"waveform": Path, "spectrogram": Path}``
     """
-    # Try to find the WAV (prefer processed, fall back to upload)
-    wav = wav_path_for(file_id, PROCESSED_DIR)
-    if not wav.exists():
-        wav = wav_path_for(file_id, UPLOAD_DIR)
-    if not wav.exists():
-        # Might need conversion from mp3
-        mp3_up = uploaded_path(file_id, ".mp3")
-        mp3_proc = processed_path(file_id, ".mp3")
-        source = mp3_proc if mp3_proc.exists() else mp3_up
-        if not source.exists():
-            raise FileNotFoundError(f"No audio found for file_id={file_id}")
-        wav = wav_path_for(file_id, source.parent)
-        mp3_to_wav(source, wav)
-
-    signal, sr = load_audio(wav, sr=None, mono=False)
-
-    waveform_title = f"Waveform{' — ' + label if label else ''}"
-    spec_title = f"Spectrogram{' — ' + label if label else ''}"
+    # Prefer processed, fall back to upload
+    try:
+        signal, sr = load_cached(file_id, PROCESSED_DIR)
+    except FileNotFoundError:
+        signal, sr = load_cached(file_id, UPLOAD_DIR)
 
     return {
-        "waveform": generate_waveform(signal, sr, file_id, title=waveform_title),
-        "spectrogram": generate_spectrogram(signal, sr, file_id, title=spec_title),
+        "waveform": generate_waveform(
+            signal, sr, file_id, title=_viz_title("Waveform", label),
+        ),
+        "spectrogram": generate_spectrogram(
+            signal, sr, file_id, title=_viz_title("Spectrogram", label),
+        ),
     }
@@ -0,0 +1,221 @@
+"""
+DSP Kernels — Numba-compiled inner loops for the heavier effects.
+
+The functions here operate on plain numpy arrays laid out as
+``(channels, samples)`` (or ``(channels, frames, bins)`` for STFT data)
+and never touch files.  They are the low-level building blocks that
+``audio_effects`` composes into user-facing effects.
+
+Numba is a hard dependency of librosa, so it is normally available.  If
+it is not, ``HAVE_NUMBA`` is ``False`` and the kernels still run as plain
+(slow) Python — callers should prefer their numpy / librosa paths then.
+"""
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+
+try:
+    import numba
+    from numba import njit, prange
+
+    HAVE_NUMBA = True
+    # Kernels run on the server's worker threads.  A TBB pool started off
+    # the main thread deadlocks interpreter shutdown, so prefer OpenMP
+    # unless the deployment has chosen a layer explicitly.
+    if "NUMBA_THREADING_LAYER_PRIORITY" not in os.environ:
+        numba.config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+except ImportError:  # pragma: no cover — numba ships with librosa
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for ``numba.njit`` when numba is missing."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+# ==========================================================================
+# Phase vocoder (pitch shift)
+# ==========================================================================
+
+@njit(parallel=True, fastmath=True, cache=True)
+def pv_advance(
+    mag: np.ndarray,
+    phase: np.ndarray,
+    time_steps: np.ndarray,
+    phi_advance: np.ndarray,
+) -> np.ndarray:
+    """
+    Time-stretch STFT frames by interpolating magnitudes and
+    accumulating phase.
+
+    Args:
+        mag: ``(channels, frames + 2, bins)`` magnitudes, zero-padded
+            with two trailing frames.
+        phase: Matching phase angles.
+        time_steps: Fractional source-frame index for every output frame.
+        phi_advance: Expected phase advance per hop for each bin.
+
+    Returns:
+        Complex STFT of shape ``(channels, len(time_steps), bins)``.
+    """
+    n_ch, _, n_bins = mag.shape
+    n_out = time_steps.shape[0]
+    out = np.empty((n_ch, n_out, n_bins), dtype=np.complex128)
+    two_pi = 2.0 * np.pi
+
+    # Phase accumulation is sequential in time, so parallelise over
+    # every (channel, bin) pair instead.
+    for job in prange(n_ch * n_bins):
+        c = job // n_bins
+        k = job % n_bins
+        acc = phase[c, 0, k]
+        for t in range(n_out):
+            step = time_steps[t]
+            i = int(step)
+            alpha = step - i
+            m = (1.0 - alpha) * mag[c, i, k] + alpha * mag[c, i + 1, k]
+            out[c, t, k] = complex(m * np.cos(acc), m * np.sin(acc))
+
+            dphi = phase[c, i + 1, k] - phase[c, i, k] - phi_advance[k]
+            dphi -= two_pi * np.round(dphi / two_pi)
+            acc += phi_advance[k] + dphi
+    return out
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def overlap_add(frames: np.ndarray, window: np.ndarray, hop: int) -> np.ndarray:
+    """
+    Windowed overlap-add of ``(channels, frames, n_fft)`` time frames.
+
+    The result is normalised by the summed squared window, so it is the
+    exact inverse of a windowed STFT.  No centre-padding is trimmed.
+    """
+    n_ch, n_frames, n_fft = frames.shape
+    length = n_fft + hop * (n_frames - 1)
+
+    norm = np.zeros(length)
+    for t in range(n_frames):
+        start = t * hop
+        for j in range(n_fft):
+            norm[start + j] += window[j] * window[j]
+
+    out = np.zeros((n_ch, length), dtype=np.float32)
+    for c in prange(n_ch):
+        for t in range(n_frames):
+            start = t * hop
+            for j in range(n_fft):
+                out[c, start + j] += frames[c, t, j] * window[j]
+        for i in range(length):
+            if norm[i] > 1e-8:
+                out[c, i] /= norm[i]
+    return out
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def linear_resample(x: np.ndarray, out_len: int) -> np.ndarray:
+    """Resample each row of ``(channels, samples)`` to *out_len* samples."""
+    n_ch, n_in = x.shape
+    out = np.empty((n_ch, out_len), dtype=np.float32)
+    scale = (n_in - 1) / max(out_len - 1, 1)
+    for c in prange(n_ch):
+        for i in range(out_len):
+            pos = i * scale
+            j = int(pos)
+            if j + 1 < n_in:
+                frac = pos - j
+                out[c, i] = (1.0 - frac) * x[c, j] + frac * x[c, j + 1]
+            else:
+                out[c, i] = x[c, n_in - 1]
+    return out
+
+
+# ==========================================================================
+# 8D audio (auto-panning)
+# ==========================================================================
+
+# One period of a sine, indexed by phase accumulation.  The pan LFO is
+# 0.05–1 Hz, so a 4096-entry table with linear interpolation is far more
+# resolution than it needs.
+_SINE_TABLE_SIZE = 4096  # must be a power of two
+SINE_TABLE = np.sin(
+    2 * np.pi * np.arange(_SINE_TABLE_SIZE) / _SINE_TABLE_SIZE
+).astype(np.float32)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def eight_d_pan(
+    left: np.ndarray,
+    right: np.ndarray,
+    out: np.ndarray,
+    sr: int,
+    pan_speed_hz: float,
+    intensity: float,
+    crossfeed: float,
+    sine_table: np.ndarray,
+) -> float:
+    """
+    Fused 8D panning: mono mix, equal-power pan, and crossfeed in one pass.
+
+    The pan LFO is read from *sine_table* (one period, power-of-two
+    length) instead of calling ``sin`` per sample.  Writes the stereo
+    result into *out* (shape ``(2, samples)``) and returns its peak
+    absolute value so callers can normalise without a second pass.
+    """
+    n = left.shape[0]
+    table_size = sine_table.shape[0]
+    mask = table_size - 1
+    phase_inc = pan_speed_hz * table_size / sr
+    peak = 0.0
+    for i in prange(n):
+        # Phase from the sample index, so iterations stay independent
+        phase = (i * phase_inc) % table_size
+        idx = int(phase)
+        frac = phase - idx
+        lfo = sine_table[idx] + frac * (sine_table[(idx + 1) & mask] - sine_table[idx])
+
+        p = 0.5 + 0.5 * intensity * lfo
+        m = 0.5 * (left[i] + right[i])
+        lo = m * np.sqrt(1.0 - p)
+        ro = m * np.sqrt(p)
+        # Both crossfeed terms use the pre-crossfeed values
+        new_l = lo * (1.0 - crossfeed) + ro * crossfeed
+        new_r = ro * (1.0 - crossfeed) + lo * crossfeed
+        out[0, i] = new_l
+        out[1, i] = new_r
+        peak = max(peak, max(abs(new_l), abs(new_r)))
+    return peak
+
+
+# ==========================================================================
+# Equalizer (cascaded biquads)
+# ==========================================================================
+
+@njit(parallel=True, fastmath=True, cache=True)
+def biquad_cascade(x: np.ndarray, sos: np.ndarray) -> np.ndarray:
+    """
+    Run ``(channels, samples)`` through a cascade of biquad sections.
+
+    *sos* uses scipy's ``(n_sections, 6)`` layout ``[b0, b1, b2, a0, a1, a2]``
+    with ``a0 == 1``.  Each section is evaluated in transposed direct
+    form II, matching ``scipy.signal.sosfilt``.
+    """
+    n_ch, n = x.shape
+    n_sections = sos.shape[0]
+    out = np.empty((n_ch, n), dtype=np.float32)
+    for c in prange(n_ch):
+        z1 = np.zeros(n_sections)
+        z2 = np.zeros(n_sections)
+        for i in range(n):
+            v = np.float64(x[c, i])
+            for s in range(n_sections):
+                y = sos[s, 0] * v + z1[s]
+                z1[s] = sos[s, 1] * v - sos[s, 4] * y + z2[s]
+                z2[s] = sos[s, 2] * v - sos[s, 5] * y
+                v = y
+            out[c, i] = v
+    return out
@@ -0,0 +1,285 @@
+"""
+API Tests for the FastAPI routers.
+
+Exercise the HTTP layer with ``TestClient``; the DSP pipeline is
+replaced by fakes where a test only cares about routing and status codes.
+Run with:  python -m pytest backend/tests/test_api.py -v
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.models.schemas import ProcessResponse
+from backend.routers import process as process_router
+from backend.routers import upload as upload_router
+from backend.routers import visualize as visualize_router
+from backend.services import visualization
+from backend.utils import file_manager
+from backend.utils.file_manager import (
+    generate_file_id,
+    processed_path,
+    uploaded_path,
+    visualization_path,
+)
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+_JOB_BODY = {"file_id": "abc", "effect": "reverse"}
+
+
+@pytest.fixture
+def client():
+    """A client whose event loop outlives single requests (background jobs)."""
+    with TestClient(app) as c:
+        yield c
+
+
+def _fake_result(file_id: str) -> ProcessResponse:
+    return ProcessResponse(
+        file_id=file_id,
+        processed_file_id="out",
+        effect="reverse",
+        processing_time_seconds=0.0,
+    )
+
+
+@pytest.fixture
+def temp_file():
+    """Write bytes to a temp-dir path for the test, removing it afterwards."""
+    written = []
+
+    def write(path, data: bytes = b"not really audio"):
+        path.write_bytes(data)
+        written.append(path)
+        return path
+
+    yield write
+    for path in written:
+        path.unlink(missing_ok=True)
+
+
+def _poll(client: TestClient, job_id: str, state: str, timeout: float = 5.0) -> dict:
+    """Poll the job until it reaches *state*, returning its last status."""
+    deadline = time.monotonic() + timeout
+    while True:
+        body = client.get(f"/process/status/{job_id}").json()
+        if body["state"] == state or time.monotonic() > deadline:
+            return body
+        time.sleep(0.01)
+
+
+# ---------------------------------------------------------------------------
+# Tests: background processing jobs
+# ---------------------------------------------------------------------------
+
+class TestProcessJobs:
+    def test_submit_returns_202(self, client, monkeypatch) -> None:
+        async def fake(**kwargs):
+            return _fake_result(kwargs["file_id"])
+
+        monkeypatch.setattr(process_router, "process_audio", fake)
+        resp = client.post("/process/jobs", json=_JOB_BODY)
+        assert resp.status_code == 202
+        assert resp.json()["job_id"]
+
+    def test_running_then_done(self, client, monkeypatch) -> None:
+        release = threading.Event()
+
+        async def fake(**kwargs):
+            await asyncio.to_thread(release.wait, 5.0)
+            return _fake_result(kwargs["file_id"])
+
+        monkeypatch.setattr(process_router, "process_audio", fake)
+        job_id = client.post("/process/jobs", json=_JOB_BODY).json()["job_id"]
+
+        status = client.get(f"/process/status/{job_id}")
+        assert status.status_code == 200
+        assert status.json()["state"] == "running"
+        assert status.json()["result"] is None
+
+        release.set()
+        body = _poll(client, job_id, "done")
+        assert body["state"] == "done"
+        assert body["result"]["processed_file_id"] == "out"
+
+    def test_pipeline_error_is_reported(self, client, monkeypatch) -> None:
+        async def fake(**kwargs):
+            raise FileNotFoundError("Uploaded file not found: abc")
+
+        monkeypatch.setattr(process_router, "process_audio", fake)
+        job_id = client.post("/process/jobs", json=_JOB_BODY).json()["job_id"]
+
+        body = _poll(client, job_id, "error")
+        assert body["state"] == "error"
+        assert body["status_code"] == 404
+        assert "abc" in body["detail"]
+
+    def test_unknown_job_is_404(self, client) -> None:
+        assert client.get("/process/status/nope").status_code == 404
+
+    def test_status_poll_prunes_expired_jobs(self, client, monkeypatch) -> None:
+        async def fake(**kwargs):
+            return _fake_result(kwargs["file_id"])
+
+        monkeypatch.setattr(process_router, "process_audio", fake)
+        job_id = client.post("/process/jobs", json=_JOB_BODY).json()["job_id"]
+        assert _poll(client, job_id, "done")["state"] == "done"
+
+        monkeypatch.setattr(process_router, "_JOB_TTL_SECONDS", -1.0)
+        assert client.get(f"/process/status/{job_id}").status_code == 404
+        assert job_id not in process_router._jobs
+
+
+# ---------------------------------------------------------------------------
+# Tests: conditional GETs
+# ---------------------------------------------------------------------------
+
+class TestConditionalGet:
+    def _assert_revalidates(self, client: TestClient, url: str, data: bytes) -> None:
+        first = client.get(url)
+        assert first.status_code == 200
+        assert first.content == data
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "public, max-age=300"
+
+        second = client.get(url, headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+    def test_download_revalidates(self, client, temp_file) -> None:
+        file_id = generate_file_id()
+        temp_file(processed_path(file_id, ".mp3"), b"ID3 mp3 bytes")
+        self._assert_revalidates(client, f"/download/{file_id}", b"ID3 mp3 bytes")
+
+    def test_image_revalidates(self, client, temp_file) -> None:
+        file_id = generate_file_id()
+        temp_file(visualization_path(file_id, "waveform"), b"\x89PNG bytes")
+        self._assert_revalidates(
+            client, f"/visualize/image/{file_id}/waveform", b"\x89PNG bytes",
+        )
+
+    def test_stale_etag_gets_full_body(self, client, temp_file) -> None:
+        file_id = generate_file_id()
+        temp_file(processed_path(file_id, ".mp3"), b"ID3 mp3 bytes")
+        resp = client.get(f"/download/{file_id}", headers={"If-None-Match": '"old"'})
+        assert resp.status_code == 200
+        assert resp.content == b"ID3 mp3 bytes"
+
+
+# ---------------------------------------------------------------------------
+# Tests: upload size limit
+# ---------------------------------------------------------------------------
+
+class TestUploadSizeLimit:
+    def test_content_length_rejected_before_body(self, client, monkeypatch) -> None:
+        """Declared oversize bodies get 413 without reaching the endpoint."""
+        monkeypatch.setattr(file_manager, "MAX_FILE_SIZE_BYTES", 1024)
+        reached = []
+        monkeypatch.setattr(
+            upload_router, "generate_file_id", lambda: reached.append(1) or "x",
+        )
+        resp = client.post(
+            "/upload", files={"file": ("big.mp3", b"\0" * (200 * 1024), "audio/mpeg")},
+        )
+        assert resp.status_code == 413
+        assert "limit" in resp.json()["detail"]
+        assert not reached
+
+    def test_streaming_limit_deletes_partial_file(self, client, monkeypatch) -> None:
+        """Bodies under the declared-length check are still cut off mid-stream."""
+        limit = 100 * 1024
+        monkeypatch.setattr(file_manager, "MAX_FILE_SIZE_BYTES", limit)
+        file_id = generate_file_id()
+        monkeypatch.setattr(upload_router, "generate_file_id", lambda: file_id)
+        resp = client.post(
+            "/upload", files={"file": ("big.mp3", b"\0" * (limit + 1), "audio/mpeg")},
+        )
+        assert resp.status_code == 413
+        assert not uploaded_path(file_id, ".mp3").exists()
+
+    def test_other_routes_pass_through(self, client, monkeypatch) -> None:
+        monkeypatch.setattr(file_manager, "MAX_FILE_SIZE_BYTES", 0)
+        assert client.get("/").status_code == 200
+
+
+# ---------------------------------------------------------------------------
+# Tests: temp files
+# ---------------------------------------------------------------------------
+
+class TestTempFiles:
+    def test_removed_directory_is_recreated(self, tmp_path, monkeypatch) -> None:
+        """Deleting a temp dir at runtime must not break later writes."""
+        monkeypatch.setattr(file_manager, "PROCESSED_DIR", tmp_path / "processed")
+        processed_path("a").write_bytes(b"x")
+        (tmp_path / "processed" / "a.mp3").unlink()
+        (tmp_path / "processed").rmdir()
+        processed_path("b").write_bytes(b"x")
+        assert (tmp_path / "processed" / "b.mp3").exists()
+
+    def test_plots_are_tracked(self, monkeypatch) -> None:
+        """Plots rendered after the MP3 get their own expiry entry."""
+        tracked = []
+        monkeypatch.setattr(visualization, "track_file", tracked.append)
+        file_id = generate_file_id()
+        signal = np.zeros(8000, dtype=np.float32)
+        try:
+            visualization.generate_waveform(signal, 8000, file_id)
+            visualization.generate_spectrogram(signal, 8000, file_id)
+            assert tracked == [
+                visualization_path(file_id, "waveform"),
+                visualization_path(file_id, "spectrogram"),
+            ]
+        finally:
+            for path in tracked:
+                path.unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# Tests: visualization render locks
+# ---------------------------------------------------------------------------
+
+class TestRenderLocks:
+    def test_failed_render_never_overlaps_a_retry(self, monkeypatch) -> None:
+        """After a failed render, waiters and latecomers still go one at a time."""
+        guard = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def failing_render(file_id: str, label: str = "") -> None:
+            with guard:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with guard:
+                active[0] -= 1
+            raise RuntimeError("render failed")
+
+        monkeypatch.setattr(visualize_router, "generate_visualizations", failing_render)
+        file_id = generate_file_id()
+
+        async def late_request() -> None:
+            await asyncio.sleep(0.075)  # while the first waiter is retrying
+            await visualize_router._ensure_visualizations(file_id)
+
+        async def main() -> list:
+            return await asyncio.gather(
+                *(visualize_router._ensure_visualizations(file_id) for _ in range(3)),
+                late_request(),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(main())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert peak[0] == 1
+        assert file_id not in visualize_router._render_locks
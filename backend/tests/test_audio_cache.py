@@ -0,0 +1,71 @@
+"""
+Unit Tests for the decoded-PCM cache.
+
+Run with:  python -m pytest backend/tests/test_audio_cache.py -v
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from backend.utils import audio_cache
+from backend.utils.audio_cache import load_cached
+
+SR = 22050  # sample rate used in tests
+
+
+def _write_wav(path, n: int = SR // 2) -> np.ndarray:
+    """Write a stereo float WAV to *path*, returning its (2, n) samples."""
+    t = np.arange(n) / SR
+    signal = np.stack([np.sin(2 * np.pi * 440 * t), 0.5 * np.sin(2 * np.pi * 220 * t)])
+    signal = signal.astype(np.float32)
+    sf.write(str(path), signal.T, SR, subtype="FLOAT")
+    return signal
+
+
+class TestLoadCached:
+    def test_decodes_once_then_maps(self, tmp_path, monkeypatch) -> None:
+        expected = _write_wav(tmp_path / "abc.wav")
+        tracked = []
+        monkeypatch.setattr(audio_cache, "track_file", tracked.append)
+
+        first, sr = load_cached("abc", tmp_path)
+        assert sr == SR
+        np.testing.assert_array_equal(first, expected)
+        assert sorted(p.name for p in tracked) == ["abc.f32.npy", "abc.sr"]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("cache hit must not decode")
+
+        monkeypatch.setattr(audio_cache, "load_audio", fail)
+        monkeypatch.setattr(audio_cache, "decode_audio", fail)
+        second, sr2 = load_cached("abc", tmp_path)
+        assert sr2 == SR
+        assert isinstance(second.base, np.memmap)
+        assert not second.flags.writeable
+        np.testing.assert_array_equal(second, expected)
+        assert len(tracked) == 2  # nothing rewritten
+
+    def test_atomic_write_leaves_no_temp_files(self, tmp_path, monkeypatch) -> None:
+        _write_wav(tmp_path / "abc.wav")
+        monkeypatch.setattr(audio_cache, "track_file", lambda path: None)
+        load_cached("abc", tmp_path)
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "abc.f32.npy", "abc.sr", "abc.wav",
+        ]
+
+    def test_half_written_cache_is_rebuilt(self, tmp_path, monkeypatch) -> None:
+        expected = _write_wav(tmp_path / "abc.wav")
+        monkeypatch.setattr(audio_cache, "track_file", lambda path: None)
+        (tmp_path / "abc.f32.npy").write_bytes(b"truncated")
+        (tmp_path / "abc.sr").write_text("")
+
+        signal, sr = load_cached("abc", tmp_path)
+        assert sr == SR
+        np.testing.assert_array_equal(signal, expected)
+
+    def test_missing_source_raises(self, tmp_path) -> None:
+        with pytest.raises(FileNotFoundError):
+            load_cached("nope", tmp_path)
@@ -0,0 +1,111 @@
+"""
+Unit Tests for the in-process codecs.
+
+Round-trips signals through ``encode_mp3`` and ``decode_audio`` to check
+layout, length and sample alignment.
+Run with:  python -m pytest backend/tests/test_audio_converter.py -v
+"""
+
+from __future__ import annotations
+
+import shutil
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from backend.utils import audio_converter
+from backend.utils.audio_converter import _lame_info_frame, decode_audio, encode_mp3
+
+SR = 44100  # sample rate used in tests
+IMPULSE_AT = 10_000
+
+needs_ffmpeg = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None, reason="pydub fallback needs ffmpeg",
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _impulse(n: int = SR, channels: int = 1) -> np.ndarray:
+    """Silence with one click at ``IMPULSE_AT``; channels get distinct gains."""
+    mono = np.zeros(n, dtype=np.float32)
+    mono[IMPULSE_AT] = 0.9
+    if channels == 1:
+        return mono
+    return np.stack([mono * (1.0 - 0.3 * c) for c in range(channels)])
+
+
+def _round_trip(signal: np.ndarray, sr: int, tmp_path) -> tuple[np.ndarray, int]:
+    return decode_audio(encode_mp3(signal, sr, tmp_path / "out.mp3"))
+
+
+def _click_position(channel: np.ndarray) -> int:
+    return int(np.argmax(np.abs(channel)))
+
+
+# ---------------------------------------------------------------------------
+# Tests: encode_mp3 → decode_audio
+# ---------------------------------------------------------------------------
+
+class TestMp3RoundTrip:
+    @pytest.mark.parametrize("sr", [44100, 48000, 22050])
+    def test_mono_keeps_length_and_alignment(self, sr, tmp_path) -> None:
+        out, out_sr = _round_trip(_impulse(sr), sr, tmp_path)
+        assert out_sr == sr
+        assert out.shape == (sr,)
+        assert abs(_click_position(out) - IMPULSE_AT) <= 1
+
+    def test_stereo_keeps_layout_and_alignment(self, tmp_path) -> None:
+        signal = _impulse(channels=2)
+        out, _ = _round_trip(signal, SR, tmp_path)
+        assert out.shape == signal.shape
+        for channel in out:
+            assert abs(_click_position(channel) - IMPULSE_AT) <= 1
+        # Channel order survives: the right channel was encoded quieter
+        assert np.abs(out[0]).max() > np.abs(out[1]).max()
+
+    def test_reprocessing_does_not_drift(self, tmp_path) -> None:
+        signal = _impulse()
+        for _ in range(3):
+            signal, _ = _round_trip(signal, SR, tmp_path)
+        assert signal.shape == (SR,)
+        assert abs(_click_position(signal) - IMPULSE_AT) <= 1
+
+    def test_info_frame_skipped_for_unparseable_stream(self) -> None:
+        assert _lame_info_frame(b"not an mp3 frame", SR, SR) == b""
+
+    @needs_ffmpeg
+    def test_more_than_two_channels_fall_back(self, tmp_path) -> None:
+        out, out_sr = _round_trip(_impulse(channels=3), SR, tmp_path)
+        assert out_sr == SR
+        assert out.ndim == 2 and out.shape[0] <= 2  # MP3 holds at most stereo
+        assert abs(out.shape[1] - SR) <= 1152
+
+    @needs_ffmpeg
+    def test_pcm16_fallback_without_lameenc(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setattr(audio_converter, "lameenc", None)
+        out, _ = _round_trip(_impulse(), SR, tmp_path)
+        assert abs(out.shape[-1] - SR) <= 1152
+
+
+# ---------------------------------------------------------------------------
+# Tests: decode_audio
+# ---------------------------------------------------------------------------
+
+class TestDecodeAudio:
+    def test_mono_wav_is_exact(self, tmp_path) -> None:
+        signal = np.linspace(-0.5, 0.5, 1000, dtype=np.float32)
+        sf.write(str(tmp_path / "a.wav"), signal, SR, subtype="FLOAT")
+        out, sr = decode_audio(tmp_path / "a.wav")
+        assert sr == SR
+        assert out.dtype == np.float32
+        np.testing.assert_array_equal(out, signal)
+
+    def test_stereo_wav_is_channels_first(self, tmp_path) -> None:
+        signal = _impulse(n=20_000, channels=2)
+        sf.write(str(tmp_path / "a.wav"), signal.T, SR, subtype="FLOAT")
+        out, _ = decode_audio(tmp_path / "a.wav")
+        np.testing.assert_array_equal(out, signal)
@@ -9,8 +9,10 @@ from __future__ import annotations
 
 import numpy as np
 import pytest
+from scipy.signal import sosfilt
 
 from backend.services.audio_effects import (
+    _design_eq_sos,
     eight_d_audio,
     equalizer,
     peak_normalize,
@@ -20,6 +22,7 @@ from backend.services.audio_effects import (
     stereo_widen,
     trim_audio,
 )
+from backend.services.dsp_kernels import biquad_cascade
 
 SR = 22050  # sample rate used in tests
 
@@ -40,6 +43,19 @@ def _stereo_signal(duration: float = 1.0) -> np.ndarray:
     return np.stack([mono, mono * 0.8], axis=0)
 
 
+def _slice_add_reverb(signal: np.ndarray, decay: float, delay_ms: int) -> np.ndarray:
+    """Reference reverb: five delayed, decaying copies added slice by slice."""
+    delay_samples = int(SR * delay_ms / 1000)
+    length = signal.shape[-1]
+    out_length = length + delay_samples * 5
+    output = np.zeros(signal.shape[:-1] + (out_length,), dtype=np.float32)
+    output[..., :length] = signal
+    for i in range(1, 6):
+        offset = delay_samples * i
+        output[..., offset:offset + length] += signal * decay ** i
+    return peak_normalize(output)
+
+
 # ---------------------------------------------------------------------------
 # Tests: peak_normalize
 # ---------------------------------------------------------------------------
@@ -55,6 +71,15 @@ class TestPeakNormalize:
         out = peak_normalize(sig)
         np.testing.assert_array_equal(out, sig)
 
+    def test_already_at_target_returns_input(self) -> None:
+        sig = np.array([0.95, -0.5, 0.1], dtype=np.float32)
+        assert peak_normalize(sig) is sig
+
+    def test_negative_peak(self) -> None:
+        sig = np.array([0.25, -0.5, 0.1], dtype=np.float32)
+        out = peak_normalize(sig, target_peak=1.0)
+        assert np.isclose(out[1], -1.0, atol=1e-6)
+
 
 # ---------------------------------------------------------------------------
 # Tests: reverse_audio
@@ -97,6 +122,13 @@ class TestPitchShift:
         out = pitch_shift(sig, SR, semitones=-2)
         assert out.shape == sig.shape
 
+    def test_octave_up_doubles_frequency(self) -> None:
+        sig = _mono_signal(1.0)
+        out = pitch_shift(sig, SR, semitones=12)
+        freqs = np.fft.rfftfreq(len(out), 1 / SR)
+        peak_hz = freqs[np.argmax(np.abs(np.fft.rfft(out)))]
+        assert abs(peak_hz - 880) < 10
+
 
 # ---------------------------------------------------------------------------
 # Tests: reverb
@@ -114,6 +146,21 @@ class TestReverb:
         assert out.shape[0] == 2
         assert out.shape[1] > sig.shape[1]
 
+    def test_mono_matches_slice_add(self) -> None:
+        sig = _mono_signal(0.5)
+        out = reverb(sig, SR, decay=0.6, delay_ms=120)
+        expected = _slice_add_reverb(sig, decay=0.6, delay_ms=120)
+        assert out.dtype == np.float32
+        assert out.shape == expected.shape
+        np.testing.assert_allclose(out, expected, atol=1e-4)
+
+    def test_stereo_matches_slice_add(self) -> None:
+        sig = _stereo_signal(0.5)
+        out = reverb(sig, SR, decay=0.3, delay_ms=50)
+        expected = _slice_add_reverb(sig, decay=0.3, delay_ms=50)
+        assert out.shape == expected.shape
+        np.testing.assert_allclose(out, expected, atol=1e-4)
+
 
 # ---------------------------------------------------------------------------
 # Tests: stereo_widen
@@ -204,6 +251,14 @@ class TestEightDAudio:
         diff = np.max(np.abs(out[0] - out[1]))
         assert diff < 0.3  # channels are nearly balanced
 
+    def test_crossfeed_is_symmetric(self) -> None:
+        """Over one full pan cycle both channels carry equal energy."""
+        sig = _mono_signal(1.0)
+        out = eight_d_audio(sig, SR, pan_speed_hz=1.0, intensity=1.0, crossfeed=0.5)
+        left_rms = np.sqrt(np.mean(out[0] ** 2))
+        right_rms = np.sqrt(np.mean(out[1] ** 2))
+        assert np.isclose(left_rms, right_rms, rtol=0.01)
+
 
 # ---------------------------------------------------------------------------
 # Tests: equalizer
@@ -232,3 +287,26 @@ class TestEqualizer:
         out = equalizer(sig, SR, band_gains_db={"mid": 6.0, "presence": -4.0})
         assert out.shape[0] == 2
         assert out.shape[1] == sig.shape[1]
+
+
+# ---------------------------------------------------------------------------
+# Tests: biquad_cascade
+# ---------------------------------------------------------------------------
+
+class TestBiquadCascade:
+    """The fastmath kernel must stay equivalent to ``scipy.signal.sosfilt``."""
+
+    _GAINS = (("bass", 9.0), ("mid", -4.0), ("presence", 6.0))
+
+    def _check(self, x: np.ndarray) -> None:
+        sos = _design_eq_sos(SR, self._GAINS)
+        out = biquad_cascade(x, sos)
+        expected = sosfilt(sos.copy(), x, axis=-1)  # sosfilt rejects read-only sos
+        assert out.shape == x.shape
+        np.testing.assert_allclose(out, expected, rtol=1e-4, atol=1e-5)
+
+    def test_matches_sosfilt_mono(self) -> None:
+        self._check(_mono_signal(0.5)[np.newaxis, :])
+
+    def test_matches_sosfilt_stereo(self) -> None:
+        self._check(_stereo_signal(0.5))
@@ -0,0 +1,283 @@
+"""
+Unit Tests for the Audio Pipeline.
+
+Covers the batch effect entry point against the single-signal one, and
+the request memo and output dedupe in ``process_audio`` with encoding
+and plotting faked.
+Run with:  python -m pytest backend/tests/test_pipeline.py -v
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from backend.models.schemas import EffectName
+from backend.services import audio_pipeline
+from backend.services.audio_pipeline import (
+    _apply_effect,
+    _apply_effect_batch,
+    process_audio,
+)
+from backend.config import PROCESSED_DIR
+from backend.utils.file_manager import (
+    generate_file_id,
+    processed_path,
+    visualization_path,
+    wav_path_for,
+)
+
+SR = 22050  # sample rate used in tests
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _tone(freq: float, amplitude: float, duration: float = 0.5) -> np.ndarray:
+    """Generate a mono sine wave."""
+    t = np.linspace(0, duration, int(SR * duration), endpoint=False)
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def _mono_batch() -> list[np.ndarray]:
+    """Equal-length mono signals with different peaks and spectra."""
+    return [_tone(110, 0.3), _tone(440, 0.8), _tone(3000, 0.5)]
+
+
+def _stereo_batch() -> list[np.ndarray]:
+    """Equal-shape stereo signals with different peaks and spectra."""
+    return [np.stack([s, s[::-1] * 0.5]) for s in _mono_batch()]
+
+
+def _assert_matches_single(
+    signals: list[np.ndarray], effect: EffectName, params: dict,
+) -> None:
+    """Batch output must equal per-signal ``_apply_effect`` output."""
+    batch = _apply_effect_batch(signals, SR, effect, params)
+    assert len(batch) == len(signals)
+    for sig, out in zip(signals, batch):
+        expected = _apply_effect(sig, SR, effect, params)
+        assert out.shape == expected.shape
+        np.testing.assert_allclose(out, expected, rtol=1e-5, atol=1e-6)
+
+
+FLAT_EQ = {"bass": 0.0, "mid": 0.0}
+BOOST_EQ = {"bass": 9.0, "presence": -6.0}
+
+
+# ---------------------------------------------------------------------------
+# Tests: _apply_effect_batch
+# ---------------------------------------------------------------------------
+
+class TestApplyEffectBatch:
+    @pytest.mark.parametrize("batch", [_mono_batch, _stereo_batch])
+    @pytest.mark.parametrize("params", [FLAT_EQ, BOOST_EQ])
+    def test_equalizer_matches_single(self, batch, params) -> None:
+        _assert_matches_single(batch(), EffectName.EQUALIZER, params)
+
+    def test_flat_equalizer_is_not_normalised(self) -> None:
+        signals = _mono_batch()
+        out = _apply_effect_batch(signals, SR, EffectName.EQUALIZER, FLAT_EQ)
+        for sig, o in zip(signals, out):
+            np.testing.assert_array_equal(o, sig)
+
+    @pytest.mark.parametrize("batch", [_mono_batch, _stereo_batch])
+    def test_trim_matches_single(self, batch) -> None:
+        params = {"start_time": 0.1, "end_time": 0.3}
+        _assert_matches_single(batch(), EffectName.TRIM, params)
+
+    @pytest.mark.parametrize("batch", [_mono_batch, _stereo_batch])
+    def test_reverse_matches_single(self, batch) -> None:
+        _assert_matches_single(batch(), EffectName.REVERSE, {})
+
+    def test_pool_path_matches_single(self) -> None:
+        params = {"decay": 0.4, "delay_ms": 60}
+        _assert_matches_single(_stereo_batch(), EffectName.REVERB, params)
+
+    def test_unequal_shapes_use_pool(self, monkeypatch) -> None:
+        signals = [_tone(220, 0.4, 0.3), _tone(880, 0.9, 0.5)]
+        calls = []
+        pool = audio_pipeline._batch_pool()
+        monkeypatch.setattr(
+            audio_pipeline, "_batch_pool",
+            lambda: calls.append(1) or pool,
+        )
+        _assert_matches_single(signals, EffectName.EQUALIZER, BOOST_EQ)
+        assert calls
+
+    def test_empty_batch(self) -> None:
+        assert _apply_effect_batch([], SR, EffectName.REVERSE, {}) == []
+
+    def test_invalid_params_raise(self) -> None:
+        with pytest.raises(ValueError):
+            _apply_effect_batch(
+                _mono_batch(), SR, EffectName.EQUALIZER, {"bass": 99.0},
+            )
+
+
+# ---------------------------------------------------------------------------
+# Tests: process_audio request memo
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """
+    Run ``process_audio`` on a fake half-second upload.
+
+    Decoding, MP3 encoding and plotting are replaced by fakes that write
+    placeholder files and count their calls; the memo and digest index
+    start empty.
+    """
+    source = _tone(440, 0.5)
+    calls = {"encode": 0, "render": 0}
+    written = []
+
+    def fake_encode(signal, sr, path):
+        calls["encode"] += 1
+        path.write_bytes(b"mp3")
+        written.append(path)
+        return path
+
+    def fake_plot(kind):
+        def plot(signal, sr, file_id, title=""):
+            calls["render"] += 1
+            path = visualization_path(file_id, kind)
+            path.write_bytes(b"png")
+            written.append(path)
+            return path
+        return plot
+
+    monkeypatch.setattr(audio_pipeline, "_decode_upload", lambda file_id: (source, SR))
+    monkeypatch.setattr(audio_pipeline, "encode_mp3", fake_encode)
+    monkeypatch.setattr(audio_pipeline, "generate_waveform", fake_plot("waveform"))
+    monkeypatch.setattr(audio_pipeline, "generate_spectrogram", fake_plot("spectrogram"))
+    monkeypatch.setattr(audio_pipeline, "_RESULT_MEMO", OrderedDict())
+    monkeypatch.setattr(audio_pipeline, "_OUTPUT_BY_DIGEST", OrderedDict())
+
+    file_id = generate_file_id()
+
+    def run(
+        effect: EffectName, params: dict,
+        visualize: bool = False, keep_wav: bool = False,
+    ):
+        return asyncio.run(process_audio(
+            file_id, effect, params, keep_wav=keep_wav, visualize=visualize,
+        ))
+
+    run.calls = calls
+    yield run
+    for path in written:
+        path.unlink(missing_ok=True)
+
+
+REVERB = {"decay": 0.5, "delay_ms": 60}
+
+
+class TestResultMemo:
+    def test_identical_request_reuses_output(self, pipeline) -> None:
+        first = pipeline(EffectName.REVERB, REVERB)
+        second = pipeline(EffectName.REVERB, dict(REVERB))
+        assert second.processed_file_id == first.processed_file_id
+        assert second.content_sha256 == first.content_sha256
+        assert pipeline.calls["encode"] == 1
+
+    def test_parameters_are_normalised(self, pipeline) -> None:
+        first = pipeline(EffectName.PITCH_SHIFT, {"semitones": 2})
+        second = pipeline(EffectName.PITCH_SHIFT, {"semitones": 2.0})
+        assert second.processed_file_id == first.processed_file_id
+        assert pipeline.calls["encode"] == 1
+
+    def test_missing_mp3_rerenders_and_replaces_entry(self, pipeline) -> None:
+        first = pipeline(EffectName.REVERB, REVERB)
+        processed_path(first.processed_file_id, ".mp3").unlink()
+        second = pipeline(EffectName.REVERB, REVERB)
+        assert second.processed_file_id != first.processed_file_id
+        assert pipeline.calls["encode"] == 2
+        assert [proc_id for proc_id, _ in audio_pipeline._RESULT_MEMO.values()] == [
+            second.processed_file_id,
+        ]
+
+    def test_missing_plots_rerender(self, pipeline) -> None:
+        first = pipeline(EffectName.REVERB, REVERB, visualize=True)
+        visualization_path(first.processed_file_id, "spectrogram").unlink()
+        second = pipeline(EffectName.REVERB, REVERB, visualize=True)
+        assert second.processed_file_id != first.processed_file_id
+        assert pipeline.calls["render"] == 4
+
+    def test_plots_requested_after_plain_run_rerender(self, pipeline) -> None:
+        first = pipeline(EffectName.REVERB, REVERB)
+        second = pipeline(EffectName.REVERB, REVERB, visualize=True)
+        assert second.processed_file_id != first.processed_file_id
+        assert pipeline.calls["render"] == 2
+
+    def test_lru_eviction(self, pipeline, monkeypatch) -> None:
+        monkeypatch.setattr(audio_pipeline, "RESULT_MEMO_SIZE", 2)
+        for decay in (0.2, 0.3, 0.4):
+            pipeline(EffectName.REVERB, {"decay": decay, "delay_ms": 60})
+        assert len(audio_pipeline._RESULT_MEMO) == 2
+        assert len(audio_pipeline._OUTPUT_BY_DIGEST) == 2
+        pipeline(EffectName.REVERB, {"decay": 0.2, "delay_ms": 60})
+        assert pipeline.calls["encode"] == 4  # the oldest entry was evicted
+
+    def test_every_output_is_tracked(self, pipeline, monkeypatch) -> None:
+        tracked = []
+        monkeypatch.setattr(audio_pipeline, "track_file", tracked.append)
+        result = pipeline(EffectName.REVERB, REVERB, keep_wav=True)
+        wav = wav_path_for(result.processed_file_id, PROCESSED_DIR)
+        assert tracked == [processed_path(result.processed_file_id, ".mp3"), wav]
+        wav.unlink()
+
+
+# ---------------------------------------------------------------------------
+# Tests: process_audio output dedupe
+# ---------------------------------------------------------------------------
+
+FLAT_EQ = {}  # unit gains: output equals the decoded input
+FULL_TRIM = {"start_time": 0.0, "end_time": 0.5}
+
+
+class TestOutputDedupe:
+    def test_identical_output_reuses_id(self, pipeline) -> None:
+        first = pipeline(EffectName.EQUALIZER, FLAT_EQ, visualize=True)
+        second = pipeline(EffectName.TRIM, FULL_TRIM, visualize=True)
+        assert second.processed_file_id == first.processed_file_id
+        assert second.content_sha256 == first.content_sha256
+        assert pipeline.calls == {"encode": 1, "render": 2}
+
+    def test_missing_mp3_forces_fresh_render(self, pipeline) -> None:
+        first = pipeline(EffectName.EQUALIZER, FLAT_EQ)
+        processed_path(first.processed_file_id, ".mp3").unlink()
+        second = pipeline(EffectName.TRIM, FULL_TRIM)
+        assert second.processed_file_id != first.processed_file_id
+        assert pipeline.calls["encode"] == 2
+
+    def test_missing_plots_force_fresh_render(self, pipeline) -> None:
+        first = pipeline(EffectName.EQUALIZER, FLAT_EQ, visualize=True)
+        visualization_path(first.processed_file_id, "waveform").unlink()
+        second = pipeline(EffectName.TRIM, FULL_TRIM, visualize=True)
+        assert second.processed_file_id != first.processed_file_id
+        assert pipeline.calls == {"encode": 2, "render": 4}
+        assert audio_pipeline._OUTPUT_BY_DIGEST[second.content_sha256] == (
+            second.processed_file_id
+        )
+
+    def test_content_sha256_populated(self, pipeline) -> None:
+        fresh = pipeline(EffectName.EQUALIZER, FLAT_EQ)
+        memo_hit = pipeline(EffectName.EQUALIZER, FLAT_EQ)
+        dedupe_hit = pipeline(EffectName.TRIM, FULL_TRIM)
+        assert pipeline.calls["encode"] == 1
+        assert fresh.content_sha256 is not None
+        assert len(fresh.content_sha256) == 64
+        assert memo_hit.content_sha256 == fresh.content_sha256
+        assert dedupe_hit.content_sha256 == fresh.content_sha256
+
+    def test_different_output_gets_new_id(self, pipeline) -> None:
+        first = pipeline(EffectName.EQUALIZER, FLAT_EQ)
+        second = pipeline(EffectName.REVERSE, {})
+        assert second.processed_file_id != first.processed_file_id
+        assert second.content_sha256 != first.content_sha256
+        assert pipeline.calls["encode"] == 2
@@ -0,0 +1,89 @@
+"""
+Audio Cache — decoded PCM kept on disk as memory-mappable float32.
+
+Decoding an MP3 costs far more than reading raw samples back, so the
+first load of a ``file_id`` writes ``{file_id}.f32.npy`` (samples) and
+``{file_id}.sr`` (sample rate) beside the source.  Later loads are a
+zero-copy ``np.load(mmap_mode="r")``.  Both files live in the temp
+directories and expire with the rest of them.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from backend.config import ALLOWED_EXTENSIONS
+from backend.utils.audio_converter import decode_audio, load_audio
+from backend.utils.file_manager import track_file
+
+logger = logging.getLogger(__name__)
+
+# Lossless working copies win over the compressed upload when both exist
+_SOURCE_EXTENSIONS: tuple[str, ...] = (".wav", ".mp3") + tuple(
+    sorted(ALLOWED_EXTENSIONS - {".wav", ".mp3"})
+)
+
+
+def _find_source(file_id: str, directory: Path) -> Path | None:
+    """Return the audio file for *file_id* in *directory*, if any."""
+    for ext in _SOURCE_EXTENSIONS:
+        path = directory / f"{file_id}{ext}"
+        if path.exists():
+            return path
+    return None
+
+
+def load_cached(file_id: str, directory: Path) -> tuple[np.ndarray, int]:
+    """
+    Load the decoded audio for *file_id*, decoding at most once.
+
+    The cache is stale when the source is newer than the ``.npy``; it is
+    then rebuilt.  Files are written under temporary names and renamed
+    into place, so concurrent readers never see a partial cache.
+
+    Returns:
+        ``(signal, sample_rate)`` — a read-only float32 array,
+        ``(samples,)`` for mono or ``(channels, samples)`` otherwise.
+
+    Raises:
+        FileNotFoundError: If *directory* holds no audio for *file_id*.
+    """
+    source = _find_source(file_id, directory)
+    if source is None:
+        raise FileNotFoundError(f"No audio found for file_id={file_id}")
+
+    npy_path = directory / f"{file_id}.f32.npy"
+    sr_path = directory / f"{file_id}.sr"
+    try:
+        if npy_path.stat().st_mtime_ns >= source.stat().st_mtime_ns:
+            sr = int(sr_path.read_text())
+            # asarray drops the memmap subclass; the view stays mapped
+            return np.asarray(np.load(npy_path, mmap_mode="r")), sr
+    except (OSError, ValueError):
+        pass  # missing or half-written cache — rebuild it
+
+    if source.suffix == ".wav":
+        signal, sr = load_audio(source)  # libsndfile, no codec needed
+    else:
+        signal, sr = decode_audio(source)
+    signal = signal.astype(np.float32, copy=False)
+
+    # The sample rate goes in first: a valid .npy implies a valid .sr
+    suffix = f".{os.getpid()}-{threading.get_ident()}.tmp"
+    sr_tmp = sr_path.with_name(sr_path.name + suffix)
+    sr_tmp.write_text(str(sr))
+    os.replace(sr_tmp, sr_path)
+    npy_tmp = npy_path.with_name(npy_path.name + suffix)
+    with open(npy_tmp, "wb") as fh:
+        np.save(fh, signal)
+    os.replace(npy_tmp, npy_path)
+    track_file(npy_path)
+    track_file(sr_path)
+    logger.info("Cached PCM: %s", npy_path.name)
+
+    return np.asarray(np.load(npy_path, mmap_mode="r")), sr
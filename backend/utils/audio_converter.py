@@ -1,63 +1,322 @@
 """
-Audio Converter — MP3 ↔ WAV conversion using pydub + ffmpeg.
+Audio Converter — MP3 ↔ WAV conversion and in-process codecs.
 
 All DSP in the project operates on WAV arrays; this module bridges
 the gap between user-facing MP3s and the internal representation.
+
+Decoding uses PyAV and MP3 encoding uses lameenc, both in-process.
+When either is missing the functions fall back to pydub, which shells
+out to ffmpeg; those file transcodes run on a shared process pool.
 """
 
 from __future__ import annotations
 
+import functools
+import io
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-import librosa
 import numpy as np
 import soundfile as sf
 from pydub import AudioSegment
 
 from backend.config import DEFAULT_SAMPLE_RATE
 
+try:
+    import av
+except ImportError:  # pragma: no cover — optional, pydub fallback
+    av = None
+
+try:
+    import lameenc
+except ImportError:  # pragma: no cover — optional, pydub fallback
+    lameenc = None
+
 logger = logging.getLogger(__name__)
 
 
-def mp3_to_wav(mp3_path: Path, wav_path: Path) -> Path:
+# ---------------------------------------------------------------------------
+# pydub fallback workers
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=1)
+def _transcode_pool() -> ProcessPoolExecutor:
     """
-    Convert an MP3 file to WAV using pydub (ffmpeg under the hood).
+    Long-lived worker pool for pydub transcodes, created on first use.
+
+    Workers are spawned rather than forked: the server process runs
+    threads (event loop, Numba) that a fork would copy mid-flight.
+    """
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
 
-    Args:
-        mp3_path: Source MP3 file.
-        wav_path: Destination WAV file.
+
+def _pydub_wav_to_mp3(wav_source: str | bytes, mp3_path: str, bitrate: str) -> None:
+    # In-memory WAVs travel to the worker as bytes
+    if isinstance(wav_source, bytes):
+        wav_source = io.BytesIO(wav_source)
+    audio = AudioSegment.from_file(wav_source, format="wav")
+    audio.export(mp3_path, format="mp3", bitrate=bitrate)
+
+
+# ---------------------------------------------------------------------------
+# In-process codecs
+# ---------------------------------------------------------------------------
+
+def decode_audio(path: Path) -> tuple[np.ndarray, int]:
+    """
+    Decode any ffmpeg-readable file straight into a float32 array.
 
     Returns:
-        The *wav_path* for convenience.
+        ``(signal, sample_rate)`` in the same layout as :func:`load_audio`
+        — ``(samples,)`` for mono, ``(channels, samples)`` otherwise.
     """
-    logger.info("Converting MP3 → WAV: %s", mp3_path.name)
-    audio = AudioSegment.from_mp3(str(mp3_path))
-    audio.export(str(wav_path), format="wav")
-    return wav_path
+    logger.info("Decoding: %s", path.name)
+    if av is None:
+        audio = AudioSegment.from_file(str(path))
+        scale = float(1 << (8 * audio.sample_width - 1))
+        samples = np.asarray(audio.get_array_of_samples(), dtype=np.float32) / scale
+        signal = samples.reshape(-1, audio.channels).T
+        return (signal[0] if audio.channels == 1 else signal), audio.frame_rate
+
+    with av.open(str(path)) as container:
+        stream = container.streams.audio[0]
+        sr = stream.codec_context.sample_rate
+        # Planar float32 output: every frame is (channels, n) already
+        resampler = av.AudioResampler(format="fltp", layout=stream.layout.name, rate=sr)
+        chunks = []
+        for frame in container.decode(stream):
+            chunks.extend(f.to_ndarray() for f in resampler.resample(frame))
+        chunks.extend(f.to_ndarray() for f in resampler.resample(None))
+
+    signal = np.concatenate(chunks, axis=1)
+    return (signal[0] if signal.shape[0] == 1 else signal), sr
+
+
+def encode_mp3(
+    signal: np.ndarray, sr: int, mp3_path: Path, bitrate: str = "192k"
+) -> Path:
+    """
+    Encode a float signal directly to MP3 without an intermediate WAV.
+
+    Uses lameenc (mono / stereo); otherwise renders a WAV in memory and
+    converts it with pydub.
+
+    Returns:
+        The *mp3_path*.
+    """
+    channels = 1 if signal.ndim == 1 else signal.shape[0]
+    if lameenc is None or channels > 2:
+        # pydub parses integer PCM itself; float WAVs would need ffprobe
+        wav_buffer = save_audio(signal, sr, io.BytesIO(), subtype="PCM_16")
+        return wav_to_mp3(wav_buffer, mp3_path, bitrate=bitrate)
+
+    logger.info("Encoding MP3: %s", mp3_path.name)
+    # lameenc takes interleaved 16-bit PCM
+    pcm = (np.clip(signal, -1.0, 1.0) * 32767).astype(np.int16)
+    if pcm.ndim == 2:
+        pcm = np.ascontiguousarray(pcm.T)
+
+    encoder = lameenc.Encoder()
+    encoder.set_bit_rate(int(bitrate.rstrip("k")))
+    encoder.set_in_sample_rate(sr)
+    encoder.set_channels(channels)
+    encoder.set_quality(2)
+    frames = bytes(encoder.encode(pcm.tobytes()) + encoder.flush())
+    mp3_path.write_bytes(_lame_info_frame(frames, pcm.shape[0], sr) + frames)
+    return mp3_path
+
+
+# ---------------------------------------------------------------------------
+# Gapless playback (LAME info tag)
+# ---------------------------------------------------------------------------
+
+# lameenc writes bare audio frames.  LAME's encoder always delays the
+# signal by 576 samples and pads the last frame, so without an info tag
+# every decode (and every re-process of a result) gains ~25 ms of
+# leading silence.  The tag tells decoders how much to trim.
+_LAME_ENCODER_DELAY = 576
+
+_MPEG_BITRATES_KBPS = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MPEG_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG-1
+    2: (22050, 24000, 16000),  # MPEG-2
+    0: (11025, 12000, 8000),   # MPEG-2.5
+}
 
 
-def wav_to_mp3(wav_path: Path, mp3_path: Path, bitrate: str = "192k") -> Path:
+def _parse_frame_header(header: bytes) -> tuple[int, int, int, int]:
     """
-    Convert a WAV file back to MP3.
+    Decode a Layer III frame header.
+
+    Returns:
+        ``(frame_bytes, samples_per_frame, sample_rate, side_info_bytes)``.
+
+    Raises:
+        ValueError: If *header* is not a Layer III frame header.
+    """
+    b1, b2, b3 = header[1], header[2], header[3]
+    version = (b1 >> 3) & 3
+    if header[0] != 0xFF or (b1 & 0xE0) != 0xE0 or (b1 >> 1) & 3 != 1 or version == 1:
+        raise ValueError("not an MPEG Layer III frame")
+    mpeg1 = version == 3
+    kbps = _MPEG_BITRATES_KBPS[1 if mpeg1 else 2][b2 >> 4]
+    sr = _MPEG_SAMPLE_RATES[version][(b2 >> 2) & 3]
+    mono = (b3 >> 6) == 3
+    if mpeg1:
+        return 144_000 * kbps // sr + ((b2 >> 1) & 1), 1152, sr, 17 if mono else 32
+    return 72_000 * kbps // sr + ((b2 >> 1) & 1), 576, sr, 9 if mono else 17
+
+
+def _crc16(data: bytes) -> int:
+    """CRC-16/ARC, as used for the LAME tag checksum."""
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def _lame_info_frame(frames: bytes, n_samples: int, sr: int) -> bytes:
+    """
+    Build a silent "Info" frame carrying LAME's delay and padding.
+
+    *frames* are the encoder's audio frames for *n_samples* samples per
+    channel.  Returns ``b""`` (no tag) if the stream cannot be described,
+    e.g. when LAME resampled the input.
+    """
+    try:
+        frame_bytes, spf, frame_sr, side_info = _parse_frame_header(frames[:4])
+        n_frames, offset = 0, 0
+        while offset < len(frames):
+            offset += _parse_frame_header(frames[offset:offset + 4])[0]
+            n_frames += 1
+    except (IndexError, ValueError):
+        return b""
+    padding = n_frames * spf - _LAME_ENCODER_DELAY - n_samples
+    if frame_sr != sr or not 0 <= padding < 4096:
+        return b""
+
+    # Same header as the audio, minus the padding slot; no CRC
+    header = bytes((frames[0], frames[1] | 1, frames[2] & ~0x02, frames[3]))
+    frame_bytes -= (frames[2] >> 1) & 1
+    tag = bytearray(frame_bytes)
+    tag[:4] = header
+    pos = 4 + side_info
+    xing = (
+        b"Info"
+        + (0x0F).to_bytes(4, "big")                 # frames, bytes, TOC, quality
+        + n_frames.to_bytes(4, "big")
+        + (frame_bytes + len(frames)).to_bytes(4, "big")
+        + bytes(i * 256 // 100 for i in range(100))  # CBR: linear TOC
+        + (0).to_bytes(4, "big")                     # quality
+    )
+    lame = (
+        b"LAME3.100"
+        + b"\x01"                                    # revision 0, CBR
+        + bytes(9)                                   # lowpass, ReplayGain
+        + b"\x00"                                    # encoding flags
+        + b"\x00"                                    # bitrate (CBR: unused)
+        + (_LAME_ENCODER_DELAY << 12 | padding).to_bytes(3, "big")
+        + bytes(4)                                   # misc, gain, preset
+        + (frame_bytes + len(frames)).to_bytes(4, "big")
+        + bytes(2)                                   # music CRC (unused)
+    )
+    end = pos + len(xing) + len(lame)
+    if end + 2 > frame_bytes:
+        return b""
+    tag[pos:end] = xing + lame
+    tag[end:end + 2] = _crc16(tag[:end]).to_bytes(2, "big")
+    return bytes(tag)
+
+
+# ---------------------------------------------------------------------------
+# File conversion
+# ---------------------------------------------------------------------------
+
+
+def wav_to_mp3(
+    wav_source: Path | io.BytesIO, mp3_path: Path, bitrate: str = "192k"
+) -> Path:
+    """
+    Convert a WAV back to MP3.
 
     Args:
-        wav_path: Source WAV.
+        wav_source: Source WAV file, or an in-memory WAV (as returned by
+            :func:`save_audio` for a ``BytesIO`` target).
         mp3_path: Destination MP3.
         bitrate: Target bitrate (default 192 kbps).
 
     Returns:
         The *mp3_path*.
     """
-    logger.info("Converting WAV → MP3: %s", wav_path.name)
-    audio = AudioSegment.from_wav(str(wav_path))
-    audio.export(str(mp3_path), format="mp3", bitrate=bitrate)
+    in_memory = isinstance(wav_source, io.BytesIO)
+    logger.info(
+        "Converting WAV → MP3: %s",
+        "<in-memory WAV>" if in_memory else wav_source.name,
+    )
+    source = wav_source if in_memory else str(wav_source)
+    if lameenc is not None:
+        signal, sr = sf.read(source, dtype="float32")
+        if signal.ndim == 1:
+            return encode_mp3(signal, sr, mp3_path, bitrate=bitrate)
+        if signal.shape[1] <= 2:
+            return encode_mp3(signal.T, sr, mp3_path, bitrate=bitrate)
+    if in_memory:
+        source = wav_source.getvalue()
+    _transcode_pool().submit(
+        _pydub_wav_to_mp3, source, str(mp3_path), bitrate,
+    ).result()
     return mp3_path
 
 
+_READ_BLOCK_FRAMES = 1 << 16  # frames per soundfile block read
+
+
+def _read_native(wav_path: Path, mono: bool) -> tuple[np.ndarray, int]:
+    """
+    Read *wav_path* at its native rate in fixed-size blocks.
+
+    The result is preallocated in its final ``(channels, samples)``
+    layout and filled block by block through one reused read buffer,
+    so there is no whole-file temporary and no transposed copy.
+    """
+    with sf.SoundFile(str(wav_path)) as f:
+        n_ch, frames = f.channels, f.frames
+        if n_ch > 1 and not mono:
+            y = np.empty((n_ch, frames), dtype=np.float32)
+        else:
+            y = np.empty(frames, dtype=np.float32)
+        buf = np.empty((_READ_BLOCK_FRAMES, n_ch), dtype=np.float32)
+        offset = 0
+        for block in f.blocks(out=buf):  # blocksize comes from buf
+            n = len(block)
+            if y.ndim == 2:
+                y[:, offset:offset + n] = block.T
+            elif n_ch == 1:
+                y[offset:offset + n] = block[:, 0]
+            else:
+                block.mean(axis=1, out=y[offset:offset + n])
+            offset += n
+        return y[..., :offset], f.samplerate
+
+
 def load_audio(wav_path: Path, sr: int | None = None, mono: bool = False) -> tuple[np.ndarray, int]:
     """
-    Load a WAV file via librosa.
+    Load a WAV file.
+
+    At the native rate (``sr=None``) soundfile streams the samples
+    straight into the output array; librosa is only used when a
+    resample is requested.
 
     Args:
         wav_path: Path to WAV file.
@@ -68,7 +327,12 @@ def load_audio(wav_path: Path, sr: int | None = None, mono: bool = False) -> tup
         ``(signal, sample_rate)`` — signal shape is ``(samples,)``
         for mono or ``(channels, samples)`` for stereo.
     """
-    y, sr_out = librosa.load(str(wav_path), sr=sr, mono=mono)
+    if sr is None:
+        y, sr_out = _read_native(wav_path, mono)
+    else:
+        import librosa  # only resampling needs it; keeps startup light
+
+        y, sr_out = librosa.load(str(wav_path), sr=sr, mono=mono)
     logger.debug(
         "Loaded %s — shape=%s, sr=%d",
         wav_path.name, y.shape, sr_out,
@@ -76,21 +340,38 @@ def load_audio(wav_path: Path, sr: int | None = None, mono: bool = False) -> tup
     return y, sr_out
 
 
-def save_audio(signal: np.ndarray, sr: int, wav_path: Path) -> Path:
+def save_audio(
+    signal: np.ndarray,
+    sr: int,
+    wav_path: Path | io.BytesIO,
+    subtype: str = "FLOAT",
+) -> Path | io.BytesIO:
     """
-    Write a numpy signal to a WAV file.
+    Write a numpy signal to a WAV file (32-bit float by default).
 
     Handles both mono ``(samples,)`` and stereo ``(2, samples)``
-    layouts.  soundfile expects ``(samples, channels)`` for multichannel,
-    so we transpose when necessary.
+    layouts.  soundfile expects interleaved ``(samples, channels)`` for
+    multichannel, so channels are interleaved in a single copy.  Float
+    samples are stored as-is, with no 16-bit quantisation pass.
+
+    *wav_path* may be a ``BytesIO``; it is rewound after writing, ready
+    to be read back without touching the disk.
 
     Returns:
         The *wav_path*.
     """
     if signal.ndim == 2:
-        # librosa uses (channels, samples); soundfile wants (samples, channels)
-        signal = signal.T
-    sf.write(str(wav_path), signal, sr)
+        # librosa uses (channels, samples); soundfile wants contiguous
+        # (samples, channels) and would otherwise copy the .T view itself
+        interleaved = np.empty(signal.shape[::-1], dtype=np.float32)
+        np.copyto(interleaved, signal.T)
+        signal = interleaved
+    if isinstance(wav_path, io.BytesIO):
+        sf.write(wav_path, signal, sr, format="WAV", subtype=subtype)
+        wav_path.seek(0)
+        logger.debug("Saved audio to in-memory WAV")
+        return wav_path
+    sf.write(str(wav_path), signal, sr, subtype=subtype)
     logger.debug("Saved audio to %s", wav_path.name)
     return wav_path
 
@@ -102,6 +383,19 @@ def get_audio_info(file_path: Path) -> dict:
     Returns:
         dict with keys ``duration``, ``sample_rate``, ``channels``.
     """
+    if av is not None:
+        with av.open(str(file_path)) as container:
+            stream = container.streams.audio[0]
+            if container.duration is not None:
+                duration = container.duration / av.time_base
+            else:
+                duration = float(stream.duration * stream.time_base)
+            return {
+                "duration": duration,
+                "sample_rate": stream.codec_context.sample_rate,
+                "channels": stream.codec_context.channels,
+            }
+
     audio = AudioSegment.from_file(str(file_path))
     return {
         "duration": audio.duration_seconds,
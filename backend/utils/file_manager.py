@@ -6,8 +6,9 @@ and automatic cleanup of stale temporary files.
 from __future__ import annotations
 
 import logging
+import os
 import time
-import uuid
+from collections import deque
 from pathlib import Path
 
 from backend.config import (
@@ -21,34 +22,47 @@ from backend.config import (
 
 logger = logging.getLogger(__name__)
 
+_TTL_SECONDS: float = FILE_TTL_MINUTES * 60
+
+# (written_at, path) for every tracked temp file.  Appends happen in
+# time order, so the oldest entry is always on the left.  Plot and
+# encode threads append too; deque.append is atomic.
+_expiry_queue: deque[tuple[float, Path]] = deque()
+
 
 # ---------------------------------------------------------------------------
 # Public helpers
 # ---------------------------------------------------------------------------
 
 def generate_file_id() -> str:
-    """Return a new UUID-4 string for file naming."""
-    return uuid.uuid4().hex
+    """Return a new random 32-char hex id (128 bits, like a UUID-4) for file naming."""
+    return os.urandom(16).hex()
+
+
+def _ensure_dir(directory: Path) -> Path:
+    """Create *directory* if missing, so a removed temp dir comes back."""
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
 
 
 def uploaded_path(file_id: str, ext: str = ".mp3") -> Path:
     """Return the canonical path for an uploaded file."""
-    return UPLOAD_DIR / f"{file_id}{ext}"
+    return _ensure_dir(UPLOAD_DIR) / f"{file_id}{ext}"
 
 
 def processed_path(file_id: str, ext: str = ".mp3") -> Path:
     """Return the canonical path for a processed file."""
-    return PROCESSED_DIR / f"{file_id}{ext}"
+    return _ensure_dir(PROCESSED_DIR) / f"{file_id}{ext}"
 
 
 def wav_path_for(file_id: str, directory: Path = UPLOAD_DIR) -> Path:
     """Return the WAV working-copy path inside *directory*."""
-    return directory / f"{file_id}.wav"
+    return _ensure_dir(directory) / f"{file_id}.wav"
 
 
 def visualization_path(file_id: str, kind: str) -> Path:
     """Return path for a visualisation image (kind = 'waveform' | 'spectrogram')."""
-    return VISUALIZATION_DIR / f"{file_id}_{kind}.png"
+    return _ensure_dir(VISUALIZATION_DIR) / f"{file_id}_{kind}.png"
 
 
 # ---------------------------------------------------------------------------
@@ -87,6 +101,41 @@ def validate_file_size(size: int) -> None:
 # Cleanup
 # ---------------------------------------------------------------------------
 
+def track_file(path: Path) -> None:
+    """Record a freshly written temp file so cleanup wakes when it expires."""
+    _expiry_queue.append((time.time(), path))
+
+
+def seconds_until_next_expiry() -> float:
+    """
+    Seconds until the oldest tracked file passes its TTL.
+
+    Falls back to half the TTL when nothing is tracked, so files left by
+    a previous process (or never tracked) are still swept eventually.
+    """
+    if not _expiry_queue:
+        return _TTL_SECONDS / 2
+    written_at, _ = _expiry_queue[0]
+    return max(1.0, written_at + _TTL_SECONDS - time.time())
+
+
+def has_temp_files() -> bool:
+    """
+    Return ``True`` if any temp directory holds at least one entry.
+
+    Stops at the first entry found, so it is cheap enough to gate the
+    periodic cleanup on.
+    """
+    for directory in (UPLOAD_DIR, PROCESSED_DIR, VISUALIZATION_DIR):
+        try:
+            with os.scandir(directory) as it:
+                if next(it, None) is not None:
+                    return True
+        except FileNotFoundError:
+            continue
+    return False
+
+
 def cleanup_old_files() -> int:
     """
     Delete files older than ``FILE_TTL_MINUTES`` from temp dirs.
@@ -94,17 +143,27 @@ def cleanup_old_files() -> int:
     Returns:
         Number of files deleted.
     """
-    cutoff = time.time() - FILE_TTL_MINUTES * 60
+    cutoff = time.time() - _TTL_SECONDS
+    while _expiry_queue and _expiry_queue[0][0] <= cutoff:
+        _expiry_queue.popleft()
     deleted = 0
     for directory in (UPLOAD_DIR, PROCESSED_DIR, VISUALIZATION_DIR):
-        for path in directory.iterdir():
-            try:
-                if path.is_file() and path.stat().st_mtime < cutoff:
-                    path.unlink()
-                    deleted += 1
-                    logger.debug("Cleaned up: %s", path)
-            except OSError as exc:
-                logger.warning("Cleanup failed for %s: %s", path, exc)
+        if not directory.exists():
+            continue  # created lazily; nothing written there yet
+        # DirEntry caches the file type from the directory read, so only
+        # files get a stat() call and no Path objects are built.
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    if (
+                        entry.is_file(follow_symlinks=False)
+                        and entry.stat(follow_symlinks=False).st_mtime < cutoff
+                    ):
+                        os.unlink(entry.path)
+                        deleted += 1
+                        logger.debug("Cleaned up: %s", entry.name)
+                except OSError as exc:
+                    logger.warning("Cleanup failed for %s: %s", entry.name, exc)
     if deleted:
         logger.info("Cleaned up %d stale file(s).", deleted)
     return deleted
@@ -0,0 +1,51 @@
+"""
+HTTP Cache helpers — conditional GETs for files served from temp dirs.
+
+Every temp file is written once under a UUID name, so an ETag built
+from its mtime and size is stable for as long as the file exists.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+
+CACHE_CONTROL: str = "public, max-age=300"
+
+
+def file_etag(st: os.stat_result) -> str:
+    """Return a strong ETag derived from mtime and size."""
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def cached_file_response(
+    request: Request,
+    path: Path,
+    media_type: str,
+    filename: str | None = None,
+) -> Response:
+    """
+    Serve *path* with ETag / Cache-Control headers.
+
+    Answers ``304 Not Modified`` when the client's ``If-None-Match``
+    matches.  Otherwise the stat result is handed to ``FileResponse`` so
+    Starlette does not stat the file again.
+    """
+    st = os.stat(path)
+    etag = file_etag(st)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(
+        path=str(path),
+        media_type=media_type,
+        filename=filename,
+        stat_result=st,
+        headers=headers,
+    )
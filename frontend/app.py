@@ -10,17 +10,71 @@ Run:
 
 from __future__ import annotations
 
-import io
+import json
+import re
 import time
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO
 
+import numpy as np
+import pandas as pd
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:  # optional — uploads are then buffered by requests
+    MultipartEncoder = None
 
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
 API_BASE = "http://localhost:8000"
+# Base URL for media the browser fetches itself (plots, audio players);
+# differs from API_BASE only when the backend sits behind another host name.
+BROWSER_API_BASE = API_BASE
+# Set False when the browser cannot reach the backend: plots and audio are
+# then fetched by this server and relayed to the page.
+BROWSER_FETCHES_MEDIA = True
+
+# Interval between /process/status polls while a job runs
+JOB_POLL_SECONDS = 0.5
+
+# Label for results the client recognised as a no-op (see _is_noop)
+UNCHANGED_MESSAGE = "Unchanged — identical to original"
+
+
+# Streamlit re-executes this module on every rerun, so long-lived objects
+# come from st.cache_resource: one instance per server process, shared by
+# all reruns and sessions.
+@st.cache_resource(show_spinner=False)
+def get_http() -> requests.Session:
+    """Pooled session for every API call, reusing keep-alive connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=2, backoff_factor=0.2),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource(show_spinner=False)
+def get_pool() -> ThreadPoolExecutor:
+    """Small pool for overlapping independent GETs (e.g. the two plot images)."""
+    return ThreadPoolExecutor(max_workers=4)
+
+
+SESSION = get_http()
+IO_POOL = get_pool()
+
+# Responses for a file_id never change, but the backend deletes its files
+# after FILE_TTL_MINUTES (30), so cached entries must not outlive them.
+CACHE_TTL_SECONDS = 30 * 60
 
 EFFECTS = {
     "🔄 Reverse Audio": {
@@ -74,217 +128,275 @@ EFFECTS = {
     },
 }
 
+# Slider arguments per effect, coerced to each parameter's type up front:
+# (key, label, min, max, default, step).  Int parameters need int bounds,
+# or st.slider would hand back floats.
+SLIDER_SPECS: dict[str, list[tuple]] = {
+    cfg["value"]: [
+        (key, p["label"], *(type(p["default"])(p[f]) for f in ("min", "max", "default", "step")))
+        for key, p in cfg["params"].items()
+    ]
+    for cfg in EFFECTS.values()
+}
+
+# 7-band equalizer: (parameter key, label, centre frequency)
+EQ_BANDS = [
+    ("sub_bass", "Sub Bass", "60 Hz"),
+    ("bass", "Bass", "170 Hz"),
+    ("low_mid", "Low Mid", "500 Hz"),
+    ("mid", "Mid", "1 kHz"),
+    ("high_mid", "High Mid", "3 kHz"),
+    ("presence", "Presence", "6 kHz"),
+    ("brilliance", "Brilliance", "12 kHz"),
+]
+EQ_KEYS = [key for key, _, _ in EQ_BANDS]
+
+# Starting table for the EQ editor; st.data_editor never mutates it
+_EQ_TABLE = pd.DataFrame({
+    "Band": [label for _, label, _ in EQ_BANDS],
+    "Frequency": [freq for _, _, freq in EQ_BANDS],
+    "Gain (dB)": [0.0] * len(EQ_BANDS),
+})
+
 
 # ---------------------------------------------------------------------------
 # Custom CSS — premium dark AudioAlter-inspired theme
 # ---------------------------------------------------------------------------
+_CSS = """
+<style>
+@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
+
+/* ── Global ──────────────────────────────────────────────── */
+html, body, [class*="css"] {
+    font-family: 'Inter', sans-serif;
+}
+.stApp {
+    background: linear-gradient(160deg, #0a0a10 0%, #0f0f1a 40%, #12101f 100%);
+}
+
+/* ── Header ──────────────────────────────────────────────── */
+.hero-title {
+    font-size: 2.6rem;
+    font-weight: 800;
+    background: linear-gradient(135deg, #7c3aed 0%, #a855f7 50%, #c084fc 100%);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    margin-bottom: 0;
+    letter-spacing: -0.5px;
+}
+.hero-subtitle {
+    color: #8888aa;
+    font-size: 1.05rem;
+    font-weight: 300;
+    margin-top: 4px;
+    margin-bottom: 28px;
+}
+
+/* ── Cards ───────────────────────────────────────────────── */
+.glass-card {
+    background: rgba(255,255,255,0.03);
+    border: 1px solid rgba(124,58,237,0.15);
+    border-radius: 16px;
+    padding: 24px;
+    margin-bottom: 20px;
+    backdrop-filter: blur(12px);
+    transition: border-color 0.3s;
+}
+.glass-card:hover {
+    border-color: rgba(124,58,237,0.35);
+}
+
+/* ── Effect Badge ────────────────────────────────────────── */
+.effect-badge {
+    display: inline-block;
+    padding: 6px 16px;
+    border-radius: 999px;
+    font-size: 0.8rem;
+    font-weight: 600;
+    letter-spacing: 0.5px;
+    background: linear-gradient(135deg, #7c3aed, #6d28d9);
+    color: #fff;
+    margin-bottom: 10px;
+}
+
+/* ── Stat Pill ───────────────────────────────────────────── */
+.stat-row {
+    display: flex;
+    gap: 12px;
+    flex-wrap: wrap;
+    margin-top: 10px;
+}
+.stat-pill {
+    background: rgba(124,58,237,0.12);
+    border: 1px solid rgba(124,58,237,0.2);
+    border-radius: 10px;
+    padding: 8px 16px;
+    font-size: 0.82rem;
+    color: #c4b5fd;
+}
+.stat-pill b { color: #e0d4fc; }
+
+/* ── Dividers ────────────────────────────────────────────── */
+.section-divider {
+    border: none;
+    border-top: 1px solid rgba(124,58,237,0.15);
+    margin: 28px 0;
+}
+
+/* ── Sidebar Styling ─────────────────────────────────────── */
+section[data-testid="stSidebar"] {
+    background: linear-gradient(180deg, #0d0d18 0%, #111126 100%);
+    border-right: 1px solid rgba(124,58,237,0.12);
+}
+
+/* ── Buttons ─────────────────────────────────────────────── */
+.stButton > button {
+    background: linear-gradient(135deg, #7c3aed 0%, #6d28d9 100%) !important;
+    color: white !important;
+    border: none !important;
+    border-radius: 10px !important;
+    padding: 10px 28px !important;
+    font-weight: 600 !important;
+    font-size: 0.95rem !important;
+    transition: all 0.3s ease !important;
+    box-shadow: 0 4px 15px rgba(124,58,237,0.3) !important;
+}
+.stButton > button:hover {
+    transform: translateY(-2px) !important;
+    box-shadow: 0 6px 25px rgba(124,58,237,0.45) !important;
+}
+
+/* ── Download Button ─────────────────────────────────────── */
+.stDownloadButton > button {
+    background: linear-gradient(135deg, #059669 0%, #10b981 100%) !important;
+    color: white !important;
+    border: none !important;
+    border-radius: 10px !important;
+    font-weight: 600 !important;
+    box-shadow: 0 4px 15px rgba(16,185,129,0.3) !important;
+}
+.stDownloadButton > button:hover {
+    transform: translateY(-2px) !important;
+    box-shadow: 0 6px 25px rgba(16,185,129,0.45) !important;
+}
+
+/* ── Slider Labels ───────────────────────────────────────── */
+.stSlider label { color: #c4b5fd !important; font-weight: 500 !important; }
+
+/* ── Selectbox ───────────────────────────────────────────── */
+.stSelectbox label { color: #c4b5fd !important; font-weight: 500 !important; }
+
+/* ── File Uploader ───────────────────────────────────────── */
+[data-testid="stFileUploader"] {
+    border: 2px dashed rgba(124,58,237,0.3) !important;
+    border-radius: 14px !important;
+    padding: 16px !important;
+}
+
+/* ── Processing timer ────────────────────────────────────── */
+.timer-text {
+    font-size: 0.85rem;
+    color: #a78bfa;
+    font-weight: 500;
+}
+
+/* ── Scrollbar ───────────────────────────────────────────── */
+::-webkit-scrollbar { width: 6px; }
+::-webkit-scrollbar-track { background: #0f0f14; }
+::-webkit-scrollbar-thumb { background: #7c3aed44; border-radius: 6px; }
+::-webkit-scrollbar-thumb:hover { background: #7c3aed88; }
+
+/* ── Image borders ───────────────────────────────────────── */
+img {
+    border-radius: 12px;
+}
+
+/* ── Equalizer Band Columns ───────────────────────────────── */
+.eq-container {
+    display: flex;
+    justify-content: space-between;
+    gap: 4px;
+    padding: 16px 4px;
+    background: rgba(255,255,255,0.02);
+    border: 1px solid rgba(124,58,237,0.12);
+    border-radius: 12px;
+    margin-bottom: 16px;
+}
+.eq-band {
+    display: flex;
+    flex-direction: column;
+    align-items: center;
+    flex: 1;
+    min-width: 0;
+}
+.eq-band .eq-value {
+    font-size: 0.72rem;
+    font-weight: 700;
+    color: #a78bfa;
+    margin-bottom: 4px;
+    font-variant-numeric: tabular-nums;
+}
+.eq-band .eq-freq {
+    font-size: 0.62rem;
+    font-weight: 600;
+    color: #7c3aed;
+    margin-top: 4px;
+    text-transform: uppercase;
+    letter-spacing: 0.3px;
+}
+.eq-band .eq-label {
+    font-size: 0.58rem;
+    color: #6b6b8a;
+    margin-top: 1px;
+}
+</style>
+"""
+
+
+@st.cache_resource(show_spinner=False)
+def _css_blob() -> str:
+    """The stylesheet minified to one line, built once per server process."""
+    css = re.sub(r"/\*.*?\*/", "", _CSS, flags=re.S)
+    return " ".join(line.strip() for line in css.splitlines() if line.strip())
+
+
 def inject_css() -> None:
-    st.markdown(
-        """
-        <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
-
-        /* ── Global ──────────────────────────────────────────────── */
-        html, body, [class*="css"] {
-            font-family: 'Inter', sans-serif;
-        }
-        .stApp {
-            background: linear-gradient(160deg, #0a0a10 0%, #0f0f1a 40%, #12101f 100%);
-        }
-
-        /* ── Header ──────────────────────────────────────────────── */
-        .hero-title {
-            font-size: 2.6rem;
-            font-weight: 800;
-            background: linear-gradient(135deg, #7c3aed 0%, #a855f7 50%, #c084fc 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            margin-bottom: 0;
-            letter-spacing: -0.5px;
-        }
-        .hero-subtitle {
-            color: #8888aa;
-            font-size: 1.05rem;
-            font-weight: 300;
-            margin-top: 4px;
-            margin-bottom: 28px;
-        }
-
-        /* ── Cards ───────────────────────────────────────────────── */
-        .glass-card {
-            background: rgba(255,255,255,0.03);
-            border: 1px solid rgba(124,58,237,0.15);
-            border-radius: 16px;
-            padding: 24px;
-            margin-bottom: 20px;
-            backdrop-filter: blur(12px);
-            transition: border-color 0.3s;
-        }
-        .glass-card:hover {
-            border-color: rgba(124,58,237,0.35);
-        }
-
-        /* ── Effect Badge ────────────────────────────────────────── */
-        .effect-badge {
-            display: inline-block;
-            padding: 6px 16px;
-            border-radius: 999px;
-            font-size: 0.8rem;
-            font-weight: 600;
-            letter-spacing: 0.5px;
-            background: linear-gradient(135deg, #7c3aed, #6d28d9);
-            color: #fff;
-            margin-bottom: 10px;
-        }
-
-        /* ── Stat Pill ───────────────────────────────────────────── */
-        .stat-row {
-            display: flex;
-            gap: 12px;
-            flex-wrap: wrap;
-            margin-top: 10px;
-        }
-        .stat-pill {
-            background: rgba(124,58,237,0.12);
-            border: 1px solid rgba(124,58,237,0.2);
-            border-radius: 10px;
-            padding: 8px 16px;
-            font-size: 0.82rem;
-            color: #c4b5fd;
-        }
-        .stat-pill b { color: #e0d4fc; }
-
-        /* ── Dividers ────────────────────────────────────────────── */
-        .section-divider {
-            border: none;
-            border-top: 1px solid rgba(124,58,237,0.15);
-            margin: 28px 0;
-        }
-
-        /* ── Sidebar Styling ─────────────────────────────────────── */
-        section[data-testid="stSidebar"] {
-            background: linear-gradient(180deg, #0d0d18 0%, #111126 100%);
-            border-right: 1px solid rgba(124,58,237,0.12);
-        }
-
-        /* ── Buttons ─────────────────────────────────────────────── */
-        .stButton > button {
-            background: linear-gradient(135deg, #7c3aed 0%, #6d28d9 100%) !important;
-            color: white !important;
-            border: none !important;
-            border-radius: 10px !important;
-            padding: 10px 28px !important;
-            font-weight: 600 !important;
-            font-size: 0.95rem !important;
-            transition: all 0.3s ease !important;
-            box-shadow: 0 4px 15px rgba(124,58,237,0.3) !important;
-        }
-        .stButton > button:hover {
-            transform: translateY(-2px) !important;
-            box-shadow: 0 6px 25px rgba(124,58,237,0.45) !important;
-        }
-
-        /* ── Download Button ─────────────────────────────────────── */
-        .stDownloadButton > button {
-            background: linear-gradient(135deg, #059669 0%, #10b981 100%) !important;
-            color: white !important;
-            border: none !important;
-            border-radius: 10px !important;
-            font-weight: 600 !important;
-            box-shadow: 0 4px 15px rgba(16,185,129,0.3) !important;
-        }
-        .stDownloadButton > button:hover {
-            transform: translateY(-2px) !important;
-            box-shadow: 0 6px 25px rgba(16,185,129,0.45) !important;
-        }
-
-        /* ── Slider Labels ───────────────────────────────────────── */
-        .stSlider label { color: #c4b5fd !important; font-weight: 500 !important; }
-
-        /* ── Selectbox ───────────────────────────────────────────── */
-        .stSelectbox label { color: #c4b5fd !important; font-weight: 500 !important; }
-
-        /* ── File Uploader ───────────────────────────────────────── */
-        [data-testid="stFileUploader"] {
-            border: 2px dashed rgba(124,58,237,0.3) !important;
-            border-radius: 14px !important;
-            padding: 16px !important;
-        }
-
-        /* ── Processing timer ────────────────────────────────────── */
-        .timer-text {
-            font-size: 0.85rem;
-            color: #a78bfa;
-            font-weight: 500;
-        }
-
-        /* ── Scrollbar ───────────────────────────────────────────── */
-        ::-webkit-scrollbar { width: 6px; }
-        ::-webkit-scrollbar-track { background: #0f0f14; }
-        ::-webkit-scrollbar-thumb { background: #7c3aed44; border-radius: 6px; }
-        ::-webkit-scrollbar-thumb:hover { background: #7c3aed88; }
-
-        /* ── Image borders ───────────────────────────────────────── */
-        img {
-            border-radius: 12px;
-        }
-
-        /* ── Equalizer Band Columns ───────────────────────────────── */
-        .eq-container {
-            display: flex;
-            justify-content: space-between;
-            gap: 4px;
-            padding: 16px 4px;
-            background: rgba(255,255,255,0.02);
-            border: 1px solid rgba(124,58,237,0.12);
-            border-radius: 12px;
-            margin-bottom: 16px;
-        }
-        .eq-band {
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            flex: 1;
-            min-width: 0;
-        }
-        .eq-band .eq-value {
-            font-size: 0.72rem;
-            font-weight: 700;
-            color: #a78bfa;
-            margin-bottom: 4px;
-            font-variant-numeric: tabular-nums;
-        }
-        .eq-band .eq-freq {
-            font-size: 0.62rem;
-            font-weight: 600;
-            color: #7c3aed;
-            margin-top: 4px;
-            text-transform: uppercase;
-            letter-spacing: 0.3px;
-        }
-        .eq-band .eq-label {
-            font-size: 0.58rem;
-            color: #6b6b8a;
-            margin-top: 1px;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    # Streamlit drops any element a rerun does not re-emit, so the style
+    # block is sent every run — just as one small, precomputed string.
+    st.markdown(_css_blob(), unsafe_allow_html=True)
 
 
 # ---------------------------------------------------------------------------
 # API Helpers
 # ---------------------------------------------------------------------------
 
-def api_upload(file_bytes: bytes, filename: str) -> dict | None:
-    """Upload audio to the backend. Returns response JSON or None."""
+def api_upload(file_obj: BinaryIO, filename: str) -> dict | None:
+    """
+    Upload audio to the backend. Returns response JSON or None.
+
+    *file_obj* is streamed: with requests-toolbelt the multipart body is
+    read from it in chunks rather than assembled in memory.
+    """
+    file_obj.seek(0)
     try:
-        resp = requests.post(
-            f"{API_BASE}/upload",
-            files={"file": (filename, file_bytes, "audio/mpeg")},
-            timeout=30,
-        )
+        if MultipartEncoder is not None:
+            body = MultipartEncoder(fields={
+                "file": (filename, file_obj, "audio/mpeg"),
+                "include_viz": "true",  # original plots in the same round-trip
+            })
+            resp = SESSION.post(
+                f"{API_BASE}/upload",
+                data=body,
+                headers={"Content-Type": body.content_type},
+                timeout=60,
+            )
+        else:
+            resp = SESSION.post(
+                f"{API_BASE}/upload",
+                files={"file": (filename, file_obj, "audio/mpeg")},
+                data={"include_viz": "true"},
+                timeout=60,
+            )
         resp.raise_for_status()
         return resp.json()
     except requests.RequestException as e:
@@ -292,31 +404,62 @@ def api_upload(file_bytes: bytes, filename: str) -> dict | None:
         return None
 
 
-def api_process(file_id: str, effect: str, params: dict) -> dict | None:
-    """Send a processing request. Returns response JSON or None."""
+def api_submit_job(file_id: str, effect: str, params: dict) -> str | None:
+    """Start a background processing job. Returns its job_id or None."""
     try:
-        resp = requests.post(
-            f"{API_BASE}/process",
-            json={"file_id": file_id, "effect": effect, "parameters": params},
-            timeout=120,
+        resp = SESSION.post(
+            f"{API_BASE}/process/jobs",
+            json={
+                "file_id": file_id,
+                "effect": effect,
+                "parameters": params,
+                "visualize": True,  # rendered while the MP3 encodes
+            },
+            timeout=30,
         )
         resp.raise_for_status()
+        return resp.json()["job_id"]
+    except requests.RequestException as e:
+        st.error(f"❌ Processing failed: {e}")
+        return None
+
+
+def api_job_status(job_id: str) -> dict | None:
+    """Poll a processing job. Returns the status JSON or None."""
+    try:
+        resp = SESSION.get(f"{API_BASE}/process/status/{job_id}", timeout=10)
+        resp.raise_for_status()
         return resp.json()
     except requests.RequestException as e:
         st.error(f"❌ Processing failed: {e}")
         return None
 
 
+_READ_CHUNK_BYTES = 64 * 1024
+
+
+@st.cache_data(show_spinner=False, ttl=CACHE_TTL_SECONDS, max_entries=64)
+def _cached_get(url_path: str, params: dict | None = None, timeout: int = 30) -> bytes:
+    """
+    GET an immutable backend resource, memoised across reruns.
+
+    The body is streamed into one growing buffer in 64 KiB chunks.
+    Failures raise instead of returning, so they are never cached.
+    """
+    with SESSION.get(
+        f"{API_BASE}{url_path}", params=params, timeout=timeout, stream=True,
+    ) as resp:
+        resp.raise_for_status()
+        buf = bytearray()
+        for chunk in resp.iter_content(chunk_size=_READ_CHUNK_BYTES):
+            buf += chunk
+    return bytes(buf)
+
+
 def api_visualize(file_id: str, label: str = "") -> dict | None:
     """Request visualization generation. Returns URLs dict or None."""
     try:
-        resp = requests.get(
-            f"{API_BASE}/visualize/{file_id}",
-            params={"label": label},
-            timeout=60,
-        )
-        resp.raise_for_status()
-        return resp.json()
+        return json.loads(_cached_get(f"/visualize/{file_id}", {"label": label}, timeout=60))
     except requests.RequestException as e:
         st.error(f"❌ Visualization failed: {e}")
         return None
@@ -325,24 +468,83 @@ def api_visualize(file_id: str, label: str = "") -> dict | None:
 def api_get_image(url_path: str) -> bytes | None:
     """Fetch a visualization image from the backend."""
     try:
-        resp = requests.get(f"{API_BASE}{url_path}", timeout=30)
-        resp.raise_for_status()
-        return resp.content
+        return _cached_get(url_path)
     except requests.RequestException:
         return None
 
 
+def viz_image_sources(viz: dict) -> tuple[str | bytes | None, str | bytes | None]:
+    """
+    What to pass to ``st.image`` for the waveform and spectrogram.
+
+    Direct URLs when the browser can reach the backend, so the PNGs never
+    pass through this server; otherwise the downloaded bytes.
+    """
+    if BROWSER_FETCHES_MEDIA:
+        return (
+            f"{BROWSER_API_BASE}{viz['waveform_url']}",
+            f"{BROWSER_API_BASE}{viz['spectrogram_url']}",
+        )
+    return api_get_viz_images(viz)
+
+
+def api_get_viz_images(viz: dict) -> tuple[bytes | None, bytes | None]:
+    """Fetch the waveform and spectrogram images concurrently."""
+    wf_fut = IO_POOL.submit(api_get_image, viz["waveform_url"])
+    sp_fut = IO_POOL.submit(api_get_image, viz["spectrogram_url"])
+    return wf_fut.result(), sp_fut.result()
+
+
 def api_download(file_id: str) -> bytes | None:
     """Download processed MP3 bytes."""
     try:
-        resp = requests.get(f"{API_BASE}/download/{file_id}", timeout=30)
-        resp.raise_for_status()
-        return resp.content
+        return _cached_get(f"/download/{file_id}")
     except requests.RequestException as e:
         st.error(f"❌ Download failed: {e}")
         return None
 
 
+# ---------------------------------------------------------------------------
+# EQ Preview
+# ---------------------------------------------------------------------------
+
+@st.cache_data(show_spinner=False)
+def _eq_preview_html(gains: tuple[float, ...]) -> str:
+    """EQ preview bars for *gains* (one per ``EQ_BANDS`` entry), memoised."""
+    g = np.asarray(gains, dtype=float)
+    heights = np.clip(50 + g * (50 / 12), 0, 100)
+    colors = np.where(g > 1, "#10b981", np.where(g < -1, "#ef4444", "#7c3aed"))
+
+    # Build EQ container with proper HTML structure
+    parts = ['<div class="eq-container">']
+    for (_, label, freq), gain, bar_height, color in zip(EQ_BANDS, g, heights, colors):
+        parts.append(
+            '<div class="eq-band">'
+            f'<div class="eq-value">{gain:+.1f}</div>'
+            f'<div style="width:100%;height:120px;background:rgba(255,255,255,0.05);border-radius:4px;position:relative;overflow:hidden;"><div style="position:absolute;bottom:0;left:2px;right:2px;height:{bar_height}%;background:linear-gradient(to top, {color}, {color}99);border-radius:2px;transition:all 0.2s ease;"></div></div>'
+            f'<div class="eq-freq">{freq}</div>'
+            f'<div class="eq-label">{label}</div>'
+            '</div>'
+        )
+    parts.append('</div>')
+    return "".join(parts)
+
+
+# ---------------------------------------------------------------------------
+# Client-side checks
+# ---------------------------------------------------------------------------
+
+def _is_noop(effect: str, params: dict, duration: float) -> bool:
+    """True when *params* leave the audio unchanged, so nothing need run."""
+    if effect == "trim":
+        return params["start_time"] == 0 and abs(params["end_time"] - duration) < 0.05
+    if effect == "pitch_shift":
+        return params["semitones"] == 0.0
+    if effect == "equalizer":
+        return not any(params.values())
+    return False
+
+
 # ---------------------------------------------------------------------------
 # Main UI
 # ---------------------------------------------------------------------------
@@ -364,7 +566,10 @@ def main() -> None:
     )
 
     # ── Session state init ────────────────────────────────────────────────
-    for key in ("upload_info", "processed_info", "original_viz", "processed_viz"):
+    for key in (
+        "upload_info", "processed_info", "original_viz", "processed_viz",
+        "original_bytes", "original_mime", "pending_job",
+    ):
         if key not in st.session_state:
             st.session_state[key] = None
 
@@ -380,19 +585,22 @@ def main() -> None:
         )
 
         if uploaded_file is not None:
-            file_bytes = uploaded_file.getvalue()
-
             # Auto-upload on new file
             if (
                 st.session_state.upload_info is None
                 or st.session_state.upload_info.get("filename") != uploaded_file.name
             ):
                 with st.spinner("Uploading…"):
-                    info = api_upload(file_bytes, uploaded_file.name)
+                    info = api_upload(uploaded_file, uploaded_file.name)
                 if info:
                     st.session_state.upload_info = info
+                    # The original player plays these; no need to download them back
+                    st.session_state.original_bytes = uploaded_file.getvalue()
+                    st.session_state.original_mime = uploaded_file.type or "audio/mpeg"
                     st.session_state.processed_info = None
-                    st.session_state.original_viz = None
+                    # Plot URLs rendered during the upload, if the backend
+                    # managed to; otherwise /visualize is asked below
+                    st.session_state.original_viz = info.get("viz")
                     st.session_state.processed_viz = None
 
             upload_info = st.session_state.upload_info
@@ -421,136 +629,157 @@ def main() -> None:
         effect_cfg = EFFECTS[effect_name]
         st.markdown(f"*{effect_cfg['description']}*")
 
-        # ── Dynamic Parameters ────────────────────────────────────────────
-        params: dict = {}
-        is_eq = effect_cfg.get("custom_ui", False) and effect_cfg["value"] == "equalizer"
-        is_trim = effect_cfg["value"] == "trim"
-
-        if is_eq:
-            # ── 7-Band Parametric Equalizer ──────────────────────────────
-            st.markdown("#### 🎚️ 7-Band Equalizer")
-            
-            # Define the 7 EQ bands with frequencies
-            eq_bands = [
-                ("sub_bass", "Sub Bass", "60 Hz"),
-                ("bass", "Bass", "170 Hz"),
-                ("low_mid", "Low Mid", "500 Hz"),
-                ("mid", "Mid", "1 kHz"),
-                ("high_mid", "High Mid", "3 kHz"),
-                ("presence", "Presence", "6 kHz"),
-                ("brilliance", "Brilliance", "12 kHz"),
-            ]
+        # Parameters are batched in a form: moving a slider no longer reruns
+        # the whole app, only pressing Process does.
+        with st.form("effect_form", clear_on_submit=False):
+            # ── Dynamic Parameters ────────────────────────────────────────
+            params: dict = {}
+            is_eq = effect_cfg.get("custom_ui", False) and effect_cfg["value"] == "equalizer"
+            is_trim = effect_cfg["value"] == "trim"
+            eq_touched = False  # any EQ band moved off 0 dB
+
+            if is_eq:
+                # ── 7-Band Parametric Equalizer ──────────────────────────
+                st.markdown("#### 🎚️ 7-Band Equalizer")
             
-            # Create two columns for the sliders
-            cols = st.columns(2)
-            for idx, (band_key, band_label, band_freq) in enumerate(eq_bands):
-                col = cols[idx % 2]
-                with col:
-                    params[band_key] = st.slider(
-                        f"{band_label} ({band_freq})",
-                        min_value=-12.0,
-                        max_value=12.0,
-                        value=0.0,
-                        step=0.5,
-                        key=f"eq_{band_key}",
-                    )
+                # All seven gains live in one editor, read back in one go
+                eq_table = st.data_editor(
+                    _EQ_TABLE,
+                    column_config={
+                        "Gain (dB)": st.column_config.NumberColumn(
+                            min_value=-12.0,
+                            max_value=12.0,
+                            step=0.5,
+                            format="%+.1f",
+                        ),
+                    },
+                    disabled=["Band", "Frequency"],
+                    hide_index=True,
+                    use_container_width=True,
+                    key="eq_table",
+                )
+                params.update(zip(EQ_KEYS, eq_table["Gain (dB)"].fillna(0.0).tolist()))
+                eq_touched = any(params.values())
+
+            elif is_trim and st.session_state.upload_info:
+                # ── Trim: duration-aware sliders ───────────────────────────
+                duration = st.session_state.upload_info["duration_seconds"]
+                # Smart step: 0.1s for short audio, 0.5s for medium, 1s for long
+                if duration <= 30:
+                    trim_step = 0.1
+                elif duration <= 300:
+                    trim_step = 0.5
+                else:
+                    trim_step = 1.0
 
-        elif is_trim and st.session_state.upload_info:
-            # ── Trim: duration-aware sliders ───────────────────────────────
-            duration = st.session_state.upload_info["duration_seconds"]
-            # Smart step: 0.1s for short audio, 0.5s for medium, 1s for long
-            if duration <= 30:
-                trim_step = 0.1
-            elif duration <= 300:
-                trim_step = 0.5
-            else:
-                trim_step = 1.0
-
-            st.markdown("#### ✂️ Trim Range")
-            st.markdown(
-                f'<div class="stat-row"><span class="stat-pill"><b>⏱</b> '
-                f'Duration: {duration:.1f}s</span></div>',
-                unsafe_allow_html=True,
-            )
+                st.markdown("#### ✂️ Trim Range")
+                st.markdown(
+                    f'<div class="stat-row"><span class="stat-pill"><b>⏱</b> '
+                    f'Duration: {duration:.1f}s</span></div>',
+                    unsafe_allow_html=True,
+                )
 
-            params["start_time"] = st.slider(
-                "Start Time (sec)",
-                min_value=0.0,
-                max_value=max(duration - 0.1, 0.1),
-                value=0.0,
-                step=trim_step,
-                key="trim_start",
-            )
-            # End slider min = start + step, max = duration, default = duration
-            end_min = params["start_time"] + trim_step
-            params["end_time"] = st.slider(
-                "End Time (sec)",
-                min_value=round(end_min, 2),
-                max_value=round(duration, 2),
-                value=round(duration, 2),
-                step=trim_step,
-                key="trim_end",
-            )
+                params["start_time"] = st.slider(
+                    "Start Time (sec)",
+                    min_value=0.0,
+                    max_value=max(duration - 0.1, 0.1),
+                    value=0.0,
+                    step=trim_step,
+                    key="trim_start",
+                )
+                # Inside the form the start value only updates on submit, so the
+                # end slider keeps a fixed range and the order is checked then.
+                params["end_time"] = st.slider(
+                    "End Time (sec)",
+                    min_value=round(trim_step, 2),
+                    max_value=round(duration, 2),
+                    value=round(duration, 2),
+                    step=trim_step,
+                    key="trim_end",
+                )
 
-            # Show selected range
-            selected_dur = params["end_time"] - params["start_time"]
-            st.markdown(
-                f'<div class="stat-row">'
-                f'<span class="stat-pill"><b>✂️</b> '
-                f'{params["start_time"]:.1f}s → {params["end_time"]:.1f}s '
-                f'({selected_dur:.1f}s)</span></div>',
-                unsafe_allow_html=True,
-            )
+                # Show selected range
+                selected_dur = params["end_time"] - params["start_time"]
+                st.markdown(
+                    f'<div class="stat-row">'
+                    f'<span class="stat-pill"><b>✂️</b> '
+                    f'{params["start_time"]:.1f}s → {params["end_time"]:.1f}s '
+                    f'({selected_dur:.1f}s)</span></div>',
+                    unsafe_allow_html=True,
+                )
 
-        elif is_trim and st.session_state.upload_info is None:
-            st.warning("Upload an audio file first to set trim points.")
+            elif is_trim and st.session_state.upload_info is None:
+                st.warning("Upload an audio file first to set trim points.")
 
-        elif effect_cfg["params"]:
-            st.markdown("#### ⚙️ Parameters")
-            for key, cfg in effect_cfg["params"].items():
-                if isinstance(cfg["default"], float):
-                    params[key] = st.slider(
-                        cfg["label"],
-                        min_value=cfg["min"],
-                        max_value=cfg["max"],
-                        value=cfg["default"],
-                        step=cfg["step"],
-                    )
-                else:
+            elif effect_cfg["params"]:
+                st.markdown("#### ⚙️ Parameters")
+                for key, label, lo, hi, default, step in SLIDER_SPECS[effect_cfg["value"]]:
                     params[key] = st.slider(
-                        cfg["label"],
-                        min_value=int(cfg["min"]),
-                        max_value=int(cfg["max"]),
-                        value=int(cfg["default"]),
-                        step=int(cfg["step"]),
+                        label,
+                        min_value=lo,
+                        max_value=hi,
+                        value=default,
+                        step=step,
                     )
 
-        # ── 8D Audio: headphone warning ────────────────────────────────────
-        if effect_cfg["value"] == "eight_d_audio":
-            st.warning("🎧 **Use headphones** for the best 8D experience!")
+            # ── 8D Audio: headphone warning ────────────────────────────────
+            if effect_cfg["value"] == "eight_d_audio":
+                st.warning("🎧 **Use headphones** for the best 8D experience!")
 
-        st.markdown('<hr class="section-divider">', unsafe_allow_html=True)
+            st.markdown('<hr class="section-divider">', unsafe_allow_html=True)
 
-        # ── Process Button ────────────────────────────────────────────────
-        process_disabled = st.session_state.upload_info is None
-        if st.button(
-            "🚀  Process Audio",
-            use_container_width=True,
-            disabled=process_disabled,
-        ):
-            with st.spinner("🔧 Processing…"):
-                t0 = time.time()
-                result = api_process(
+            # ── Process Button ────────────────────────────────────────────
+            process_disabled = st.session_state.upload_info is None
+            submitted = st.form_submit_button(
+                "🚀  Process Audio",
+                use_container_width=True,
+                disabled=process_disabled,
+            )
+            if submitted and is_trim and params["end_time"] <= params["start_time"]:
+                st.error("End time must be after the start time.")
+            elif submitted and _is_noop(
+                effect_cfg["value"], params, st.session_state.upload_info["duration_seconds"],
+            ) and st.session_state.upload_info["filename"].lower().endswith(".mp3"):
+                # Identity settings: show the original MP3 as the result
+                # instead of decoding and re-encoding it on the backend.
+                # Same shape as a ProcessResponse; the main panel spots
+                # processed_file_id == file_id and labels it as unchanged.
+                st.session_state.processed_info = {
+                    "file_id": st.session_state.upload_info["file_id"],
+                    "processed_file_id": st.session_state.upload_info["file_id"],
+                    "effect": effect_cfg["value"],
+                    "processing_time_seconds": 0.0,
+                    "content_sha256": None,
+                    "message": UNCHANGED_MESSAGE,
+                }
+                st.session_state.processed_viz = None
+            elif submitted:
+                st.session_state.pending_job = api_submit_job(
                     st.session_state.upload_info["file_id"],
                     effect_cfg["value"],
                     params,
                 )
-                elapsed = time.time() - t0
-            if result:
-                st.session_state.processed_info = result
-                st.session_state.processed_viz = None  # reset viz
-                st.success(f"✅ Done in **{elapsed:.2f}s**")
-                st.rerun()
+
+        # ── Job polling ───────────────────────────────────────────────────
+        # The job id lives in session_state, so if another interaction
+        # interrupts this loop the next run simply resumes polling.
+        if st.session_state.pending_job:
+            with st.status("🔧 Processing…", expanded=True) as status:
+                while True:
+                    job = api_job_status(st.session_state.pending_job)
+                    if job is None or job["state"] != "running":
+                        break
+                    status.update(label=f"🔧 Processing… {job['elapsed_seconds']:.1f}s")
+                    time.sleep(JOB_POLL_SECONDS)
+                st.session_state.pending_job = None
+                if job and job["state"] == "done":
+                    status.update(label=f"✅ Done in {job['elapsed_seconds']:.2f}s", state="complete")
+                    st.session_state.processed_info = job["result"]
+                    st.session_state.processed_viz = None  # reset viz
+                    st.rerun()
+                status.update(label="❌ Processing failed", state="error")
+                if job:
+                    st.error(f"❌ Processing failed: {job['detail']}")
 
     # ══════════════════════════════════════════════════════════════════════
     # MAIN PANEL
@@ -601,8 +830,7 @@ def main() -> None:
 
     orig_viz = st.session_state.original_viz
     if orig_viz:
-        wf_img = api_get_image(orig_viz["waveform_url"])
-        sp_img = api_get_image(orig_viz["spectrogram_url"])
+        wf_img, sp_img = viz_image_sources(orig_viz)
         with col_a:
             st.markdown("**Waveform**")
             if wf_img:
@@ -612,69 +840,33 @@ def main() -> None:
             if sp_img:
                 st.image(sp_img, use_container_width=True)
 
-    # Original audio player
-    orig_audio = api_download(file_id)
+    # Original audio player — the bytes the user uploaded, kept client-side
+    orig_audio = st.session_state.original_bytes
     if orig_audio:
-        st.audio(orig_audio, format="audio/mp3")
+        st.audio(orig_audio, format=st.session_state.original_mime)
     st.markdown("</div>", unsafe_allow_html=True)
 
     # ── Equalizer Preview (if EQ is selected) ────────────────────────────
-    # Get the current gains from session state (set by sidebar sliders)
-    eq_gains = {
-        "sub_bass": st.session_state.get("eq_sub_bass", 0.0),
-        "bass": st.session_state.get("eq_bass", 0.0),
-        "low_mid": st.session_state.get("eq_low_mid", 0.0),
-        "mid": st.session_state.get("eq_mid", 0.0),
-        "high_mid": st.session_state.get("eq_high_mid", 0.0),
-        "presence": st.session_state.get("eq_presence", 0.0),
-        "brilliance": st.session_state.get("eq_brilliance", 0.0),
-    }
-    
-    # Only show if any EQ band has been adjusted (non-zero)
-    if any(v != 0.0 for v in eq_gains.values()):
+    # Only shown while the EQ is selected and a band is off 0 dB; both are
+    # settled in the sidebar, so other effects skip this entirely
+    if eq_touched:
         st.markdown('<hr class="section-divider">', unsafe_allow_html=True)
         st.markdown('<div class="glass-card"><span class="effect-badge">EQUALIZER PREVIEW</span>', unsafe_allow_html=True)
         
-        eq_bands_data = [
-            ("Sub Bass", "60 Hz", eq_gains["sub_bass"]),
-            ("Bass", "170 Hz", eq_gains["bass"]),
-            ("Low Mid", "500 Hz", eq_gains["low_mid"]),
-            ("Mid", "1 kHz", eq_gains["mid"]),
-            ("High Mid", "3 kHz", eq_gains["high_mid"]),
-            ("Presence", "6 kHz", eq_gains["presence"]),
-            ("Brilliance", "12 kHz", eq_gains["brilliance"]),
-        ]
-        
-        # Build EQ container with proper HTML structure
-        eq_html = '<div class="eq-container">'
-        for label, freq, gain in eq_bands_data:
-            bar_height = max(0, min(100, 50 + (gain / 12) * 50))
-            if gain > 1:
-                color = "#10b981"
-            elif gain < -1:
-                color = "#ef4444"
-            else:
-                color = "#7c3aed"
-            
-            eq_html += '<div class="eq-band">'
-            eq_html += f'<div class="eq-value">{gain:+.1f}</div>'
-            eq_html += f'<div style="width:100%;height:120px;background:rgba(255,255,255,0.05);border-radius:4px;position:relative;overflow:hidden;"><div style="position:absolute;bottom:0;left:2px;right:2px;height:{bar_height}%;background:linear-gradient(to top, {color}, {color}99);border-radius:2px;transition:all 0.2s ease;"></div></div>'
-            eq_html += f'<div class="eq-freq">{freq}</div>'
-            eq_html += f'<div class="eq-label">{label}</div>'
-            eq_html += '</div>'
-        eq_html += '</div>'
-        
-        st.markdown(eq_html, unsafe_allow_html=True)
+        gains = tuple(round(params[key], 1) for key in EQ_KEYS)
+        st.markdown(_eq_preview_html(gains), unsafe_allow_html=True)
         st.markdown("</div>", unsafe_allow_html=True)
 
     # ── Processed Audio Section ───────────────────────────────────────────
     proc_info = st.session_state.processed_info
     if proc_info:
         proc_id = proc_info["processed_file_id"]
+        unchanged = proc_id == proc_info["file_id"]
+        badge = UNCHANGED_MESSAGE if unchanged else f"PROCESSED — {proc_info['effect']}"
 
         st.markdown('<hr class="section-divider">', unsafe_allow_html=True)
         st.markdown(
-            f'<div class="glass-card"><span class="effect-badge">PROCESSED — {proc_info["effect"].upper()}</span>',
+            f'<div class="glass-card"><span class="effect-badge">{badge.upper()}</span>',
             unsafe_allow_html=True,
         )
 
@@ -688,8 +880,11 @@ def main() -> None:
             unsafe_allow_html=True,
         )
 
-        # Generate processed visualizations (once)
-        if st.session_state.processed_viz is None:
+        # Generate processed visualizations (once); unchanged output
+        # would only repeat the original's plots above
+        if unchanged:
+            st.caption("These settings leave the audio as uploaded; see the plots above.")
+        elif st.session_state.processed_viz is None:
             with st.spinner("Generating visualizations for processed…"):
                 viz_p = api_visualize(proc_id, label="Processed")
             if viz_p:
@@ -698,8 +893,7 @@ def main() -> None:
         proc_viz = st.session_state.processed_viz
         col_c, col_d = st.columns(2)
         if proc_viz:
-            wf_img_p = api_get_image(proc_viz["waveform_url"])
-            sp_img_p = api_get_image(proc_viz["spectrogram_url"])
+            wf_img_p, sp_img_p = viz_image_sources(proc_viz)
             with col_c:
                 st.markdown("**Waveform**")
                 if wf_img_p:
@@ -709,12 +903,16 @@ def main() -> None:
                 if sp_img_p:
                     st.image(sp_img_p, use_container_width=True)
 
-        # Processed audio player
+        # Processed audio player — the browser streams it with Range
+        # requests, so playback never waits for (or holds) the whole file
         proc_audio = api_download(proc_id)
-        if proc_audio:
+        if BROWSER_FETCHES_MEDIA:
+            st.audio(f"{BROWSER_API_BASE}/download/{proc_id}", format="audio/mp3")
+        elif proc_audio:
             st.audio(proc_audio, format="audio/mp3")
 
-            # Download button
+        # Download button
+        if proc_audio:
             st.download_button(
                 label="⬇️  Download Processed MP3",
                 data=proc_audio,